@@ -1,62 +1,206 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlmodel import Session, delete, select
 
+from app.core.cache import get_cache
+from app.core.config import get_settings
 from app.core.database import get_session
-from app.models import Availability, Campaign, CampaignEventOption, EventOption, PrivateContribution, StretchGoal, Vote
+from app.models import (
+    Availability,
+    Campaign,
+    CampaignEventOption,
+    CampaignStatus,
+    EventOption,
+    PrivateContribution,
+    StretchGoal,
+    Vote,
+)
 from app.schemas.domain import (
     ApiMessage,
     AvailabilityPayload,
+    AvailabilitySummary,
+    BestDates,
+    CampaignActivity,
     CampaignCreate,
+    CampaignListNormalized,
     CampaignRead,
+    CampaignSummary,
     CampaignUpdate,
+    Leaderboard,
     StretchGoalCreate,
     PrivateContributionCreate,
     TeamAnalytics,
     VotePayload,
 )
-from app.services.analytics import build_team_analytics
+from app.services.activity import funding_activity, vote_activity
+from app.services.analytics import aggregate_campaign_votes, score_team_analytics
+from app.services.availability import (
+    SlotCounts,
+    build_availability_summary,
+    date_candidates,
+    delete_availability_tally,
+    load_slot_counts,
+    replace_availability,
+    slots_to_mask,
+)
 from app.services.budget import add_contribution
+from app.services.campaign_json import load_department_campaigns_json
+from app.services.campaign_reads import (
+    FieldSet,
+    load_campaign_document,
+    load_campaign_documents,
+    load_campaign_documents_normalized,
+    load_campaign_summaries,
+    parse_fieldset,
+    project_document,
+    voter_key_value,
+)
+from app.services.caching import (
+    ANALYTICS,
+    CAMPAIGN,
+    availability_key,
+    campaign_ids,
+    invalidate_activity,
+    invalidate_analytics,
+    invalidate_availability,
+    invalidate_campaign,
+    invalidate_department,
+    leaderboard_key,
+)
 from app.services.campaigns import (
     ensure_department,
     get_campaign_contributions,
-    get_campaign_event_options,
     get_campaign_stretch_goals,
     hydrate_campaign,
     hydrate_campaigns,
-    hydrate_campaigns_optimized,
 )
+from app.services.leaderboard import DEFAULT_TOP_K, load_leaderboard, pick_winner
+from app.services.participation import campaign_participation, delete_voter_sketch, record_voter
+from app.services.tally import apply_vote_replacement, delete_tally
 from app.core.limiter import limiter
+from app.core.pagination import NEXT_CURSOR_HEADER, apply_keyset, split_page
+from app.core.responses import ORJSONRoute, negotiate, wants_msgpack, with_etag
 
 
-router = APIRouter(prefix="/campaigns", tags=["campaigns"])
+router = APIRouter(prefix="/campaigns", tags=["campaigns"], route_class=ORJSONRoute)
+settings = get_settings()
 
 
-@router.get("", response_model=List[CampaignRead])
+def _get_campaign_or_404(session: Session, campaign_id: str) -> Campaign:
+    """Load a campaign; ids known to be missing are rejected without a query."""
+    if campaign_ids.known_missing(campaign_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    campaign = session.get(Campaign, campaign_id)
+    if not campaign:
+        campaign_ids.record_missing(campaign_id)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return campaign
+
+
+def _parse_fieldset(fields: Optional[str], include: Optional[str]) -> FieldSet:
+    try:
+        return parse_fieldset(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("", response_model=Union[List[CampaignRead], List[CampaignSummary], CampaignListNormalized])
 def list_campaigns(
+    request: Request,
     dept_code: str = Query(..., description="Department code"),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary: aggregates instead of child arrays"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. name,status,event_options.title"),
+    include: Optional[str] = Query(None, description="Relations to load: event_options,stretch_goals,private_contributions (empty = none; with fields=, only the relations it names)"),
+    shape: str = Query("embedded", pattern="^(embedded|normalized)$", description="normalized: event options once, referenced by id"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for all campaigns"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
     session: Session = Depends(get_session),
-) -> List[CampaignRead]:
+) -> Response:
     """
     Get all campaigns for a department.
 
-    Uses optimized query to avoid N+1 problem.
-    Performance: 3 queries instead of 1 + (3 * N)
+    Built from Core row projections (see app.services.campaign_reads):
+    at most 5 queries regardless of N, no ORM objects and no second response_model
+    validation. fields= / include= limit the selected columns and loaded relations.
+    With CAMPAIGN_READ_ENGINE=sqlite_json SQLite assembles the full JSON array itself.
+
+    view=summary returns CampaignSummary rows (total funded, funding percentage,
+    contribution/vote/voter counts, unlocked stretch goals) computed in one statement.
+
+    shape=normalized (view=full only) returns CampaignListNormalized: campaigns carry
+    event_option_ids and each shared event option is sent once in a top-level map.
+
+    Campaigns are ordered by (created_at, id). With limit= the response is one page and
+    the X-Next-Cursor header continues it (keyset pagination on ix_campaign_dept_created).
+
+    Accept: application/msgpack returns the same documents MessagePack-encoded.
     """
-    campaigns = session.exec(select(Campaign).where(Campaign.dept_code == dept_code)).all()
-    return hydrate_campaigns_optimized(session, campaigns)
+    if view == "full":
+        fieldset = _parse_fieldset(fields, include)
+        if (
+            fieldset.is_full
+            and shape == "embedded"
+            and limit is None
+            and cursor is None
+            and settings.campaign_read_engine == "sqlite_json"
+            and settings.database_url.startswith("sqlite")
+            and not wants_msgpack(request)
+        ):
+            return Response(load_department_campaigns_json(session, dept_code), media_type="application/json")
+
+    try:
+        stmt = apply_keyset(
+            select(Campaign.id, Campaign.created_at).where(Campaign.dept_code == dept_code),
+            (Campaign.created_at, Campaign.id),
+            cursor,
+            limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    rows, next_cursor = split_page(session.exec(stmt).all(), limit, key=lambda r: (r.created_at, r.id))
+    page_ids = [r.id for r in rows]
+
+    if view == "summary":
+        docs = load_campaign_summaries(session, page_ids)
+    elif shape == "normalized":
+        docs = load_campaign_documents_normalized(session, page_ids, fieldset)
+    else:
+        docs = load_campaign_documents(session, page_ids, fieldset)
+    return negotiate(request, docs, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
 
 @router.get("/{campaign_id}", response_model=CampaignRead)
 def get_campaign_detail(
+    request: Request,
     campaign_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. name,status,event_options.title"),
+    include: Optional[str] = Query(None, description="Relations to load: event_options,stretch_goals,private_contributions (empty = none; with fields=, only the relations it names)"),
     session: Session = Depends(get_session),
-) -> CampaignRead:
-    campaign = session.get(Campaign, campaign_id)
-    if not campaign:
+) -> Response:
+    """
+    Get a single campaign.
+
+    Served from cache; concurrent requests for the same campaign (e.g. a QR code shown
+    in a meeting) share a single hydration. fields= / include= are applied to the
+    cached document.
+    """
+    fieldset = _parse_fieldset(fields, include)
+    if campaign_ids.known_missing(campaign_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-    return hydrate_campaign(session, campaign)
+
+    def load() -> dict:
+        doc = load_campaign_document(session, campaign_id)
+        if doc is None:
+            campaign_ids.record_missing(campaign_id)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+        return doc
+
+    doc = get_cache().get_or_set(CAMPAIGN, campaign_id, load)
+    response = negotiate(request, doc if fieldset.is_full else project_document(doc, fieldset))
+    # Booked campaigns are archived: tag them so their compressed body is reused
+    return with_etag(response) if doc["status"] == CampaignStatus.booked else response
 
 
 @router.post("", response_model=CampaignRead, status_code=status.HTTP_201_CREATED)
@@ -88,6 +232,7 @@ def create_campaign(
     session.add(campaign)
     session.commit()
     session.refresh(campaign)
+    campaign_ids.record_created(campaign.id)
 
     # Event options
     created_events: List[EventOption] = []
@@ -119,6 +264,9 @@ def create_campaign(
         )
 
     session.commit()
+    # After the last commit, so no reader re-caches the department list without
+    # the campaign's event options and stretch goals
+    invalidate_department(campaign.dept_code)
     return hydrate_campaign(session, campaign)
 
 
@@ -134,19 +282,25 @@ def delete_campaign(
     Requires the matching department code as a lightweight guard so only the creator's
     department can remove its campaigns.
     """
-    campaign = session.get(Campaign, campaign_id)
-    if not campaign:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    campaign = _get_campaign_or_404(session, campaign_id)
     if campaign.dept_code != dept_code:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Department mismatch")
 
     session.exec(delete(CampaignEventOption).where(CampaignEventOption.campaign_id == campaign_id))
     session.exec(delete(StretchGoal).where(StretchGoal.campaign_id == campaign_id))
     session.exec(delete(Vote).where(Vote.campaign_id == campaign_id))
+    delete_tally(session, campaign_id)
+    delete_voter_sketch(session, campaign_id)
+    delete_availability_tally(session, campaign_id)
     session.exec(delete(Availability).where(Availability.campaign_id == campaign_id))
     session.exec(delete(PrivateContribution).where(PrivateContribution.campaign_id == campaign_id))
     session.exec(delete(Campaign).where(Campaign.id == campaign_id))
     session.commit()
+    invalidate_campaign(campaign_id)
+    invalidate_department(dept_code)
+    invalidate_activity(campaign_id, "votes")
+    invalidate_activity(campaign_id, "funding")
+    campaign_ids.record_deleted(campaign_id)
     return ApiMessage(message="Campaign deleted")
 
 
@@ -156,9 +310,7 @@ def update_campaign(
     payload: CampaignUpdate,
     session: Session = Depends(get_session),
 ) -> CampaignRead:
-    campaign = session.get(Campaign, campaign_id)
-    if not campaign:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    campaign = _get_campaign_or_404(session, campaign_id)
 
     update_data = payload.model_dump(exclude_none=True)
     for field, value in update_data.items():
@@ -167,6 +319,8 @@ def update_campaign(
     session.add(campaign)
     session.commit()
     session.refresh(campaign)
+    invalidate_campaign(campaign_id)
+    invalidate_department(campaign.dept_code)
     return hydrate_campaign(session, campaign)
 
 
@@ -176,9 +330,7 @@ def replace_stretch_goals(
     goals: List[StretchGoalCreate],
     session: Session = Depends(get_session),
 ) -> CampaignRead:
-    campaign = session.get(Campaign, campaign_id)
-    if not campaign:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    campaign = _get_campaign_or_404(session, campaign_id)
 
     # Remove existing stretch goals for this campaign
     session.exec(delete(StretchGoal).where(StretchGoal.campaign_id == campaign_id))
@@ -196,6 +348,7 @@ def replace_stretch_goals(
             )
         )
     session.commit()
+    invalidate_campaign(campaign_id)
     return hydrate_campaign(session, campaign)
 
 
@@ -214,28 +367,45 @@ def submit_votes(
 
     Rate limit: 10 requests per minute per IP to prevent vote spamming.
     """
-    campaign = session.get(Campaign, campaign_id)
-    if not campaign:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    campaign = _get_campaign_or_404(session, campaign_id)
 
     # Replace existing votes for the same user or session context
+    previous = []
+    replaced = None
     if user_id:
-        session.exec(delete(Vote).where(Vote.campaign_id == campaign_id, Vote.user_id == user_id))
+        replaced = (Vote.campaign_id == campaign_id, Vote.user_id == user_id)
     elif session_id:
-        session.exec(delete(Vote).where(Vote.campaign_id == campaign_id, Vote.session_id == session_id))
-
-    for payload in votes:
-        session.add(
-            Vote(
-                campaign_id=campaign_id,
-                event_id=payload.event_id,
-                weight=payload.weight,
-                is_super_like=payload.is_super_like,
-                user_id=user_id,
-                session_id=session_id,
-            )
+        replaced = (Vote.campaign_id == campaign_id, Vote.session_id == session_id)
+    if replaced is not None:
+        # DELETE ... RETURNING takes the write lock before anything is read, so concurrent
+        # submissions by the same voter each subtract only the votes they removed themselves
+        previous = session.exec(
+            delete(Vote)
+            .where(*replaced)
+            .returning(Vote.event_id, Vote.weight, Vote.is_super_like, Vote.user_id, Vote.session_id)
+        ).all()
+
+    new_votes = [
+        Vote(
+            campaign_id=campaign_id,
+            event_id=payload.event_id,
+            weight=payload.weight,
+            is_super_like=payload.is_super_like,
+            user_id=user_id,
+            session_id=session_id,
         )
+        for payload in votes
+    ]
+    apply_vote_replacement(session, campaign_id, previous, new_votes)
+    if new_votes:
+        record_voter(session, campaign_id, voter_key_value(user_id, session_id))
+    session.add_all(new_votes)
     session.commit()
+    invalidate_analytics(campaign_id)
+    invalidate_department(campaign.dept_code)
+    if previous:
+        # Replaced votes disappear from already closed activity buckets
+        invalidate_activity(campaign_id, "votes")
     return ApiMessage(message="Votes stored")
 
 
@@ -247,29 +417,65 @@ def submit_availability(
     user_id: Optional[str] = Query(None, description="User identifier (optional)"),
     session_id: Optional[str] = Query(None, description="Client session identifier (optional)"),
 ) -> ApiMessage:
-    campaign = session.get(Campaign, campaign_id)
-    if not campaign:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
-
-    if user_id:
-        session.exec(delete(Availability).where(Availability.campaign_id == campaign_id, Availability.user_id == user_id))
-    elif session_id:
-        session.exec(delete(Availability).where(Availability.campaign_id == campaign_id, Availability.session_id == session_id))
+    campaign = _get_campaign_or_404(session, campaign_id)
 
+    # One row per date: entries for the same date are merged into one slot mask
+    masks = {}
     for slot in availability:
-        session.add(
-            Availability(
-                campaign_id=campaign_id,
-                date=slot.date,
-                slots=slot.slots,
-                user_id=user_id,
-                session_id=session_id,
-            )
-        )
+        masks[slot.date] = masks.get(slot.date, 0) | slots_to_mask(slot.slots)
+    # Replaces existing availability for the same user or session context
+    replace_availability(session, campaign_id, user_id, session_id, masks)
     session.commit()
+    invalidate_availability(campaign_id)
     return ApiMessage(message="Availability stored")
 
 
+def _load_slot_counts(session: Session, campaign_id: str) -> SlotCounts:
+    return get_cache().get_or_set(ANALYTICS, availability_key(campaign_id), lambda: load_slot_counts(session, campaign_id))
+
+
+@router.get("/{campaign_id}/availability/summary", response_model=AvailabilitySummary)
+def get_availability_summary(
+    request: Request,
+    campaign_id: str,
+    session: Session = Depends(get_session),
+) -> Response:
+    """Participants per date and slot, plus the best-attended date/slot combinations."""
+    _get_campaign_or_404(session, campaign_id)
+    slot_counts = _load_slot_counts(session, campaign_id)
+    summary = build_availability_summary(campaign_id, slot_counts)
+    return negotiate(request, summary.model_dump(mode="json"))
+
+
+@router.get("/{campaign_id}/availability/best-dates", response_model=BestDates)
+def get_best_dates(
+    request: Request,
+    campaign_id: str,
+    limit: int = Query(5, ge=1, le=50, description="Number of date/slot combinations"),
+    min_attendees: Optional[int] = Query(
+        None, ge=1, description="Minimum headcount; defaults to the winning event's group size minimum"
+    ),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Date/slot combinations ranked by available participants; the first is the proposal."""
+    campaign = _get_campaign_or_404(session, campaign_id)
+    if min_attendees is None and campaign.winning_event_id:
+        event = session.get(EventOption, campaign.winning_event_id)
+        if event is not None:
+            min_attendees = event.recommended_group_size_min or event.min_participants
+
+    slot_counts = _load_slot_counts(session, campaign_id)
+    candidates = date_candidates(slot_counts, limit, min_attendees or 1)
+    best_dates = BestDates(
+        campaign_id=campaign_id,
+        participant_count=slot_counts.participant_count,
+        min_attendees=min_attendees,
+        best=candidates[0] if candidates else None,
+        runner_ups=candidates[1:],
+    )
+    return negotiate(request, best_dates.model_dump(mode="json"))
+
+
 @router.post("/{campaign_id}/contributions", response_model=CampaignRead, status_code=status.HTTP_201_CREATED)
 @limiter.limit("5/minute")
 def add_campaign_contribution(
@@ -283,9 +489,7 @@ def add_campaign_contribution(
 
     Rate limit: 5 requests per minute per IP to prevent abuse.
     """
-    campaign = session.get(Campaign, campaign_id)
-    if not campaign:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    campaign = _get_campaign_or_404(session, campaign_id)
 
     new_contribution = PrivateContribution(
         campaign_id=campaign_id,
@@ -295,19 +499,84 @@ def add_campaign_contribution(
         is_anonymous=contribution.is_anonymous,
         badge=contribution.badge,
     )
-    updated_campaign, _, _ = add_contribution(session, campaign, new_contribution)
+    updated_campaign = add_contribution(session, campaign, new_contribution)
+    invalidate_campaign(campaign_id)
+    invalidate_department(updated_campaign.dept_code)
     return hydrate_campaign(session, updated_campaign)
 
 
 @router.get("/{campaign_id}/analytics", response_model=TeamAnalytics)
 def get_campaign_analytics(
+    request: Request,
     campaign_id: str,
     session: Session = Depends(get_session),
-) -> TeamAnalytics:
-    campaign = session.get(Campaign, campaign_id)
-    if not campaign:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+) -> Response:
+    def load() -> TeamAnalytics:
+        campaign = _get_campaign_or_404(session, campaign_id)
+        participation = campaign_participation(session, campaign_id, campaign.dept_code)
+        return score_team_analytics(aggregate_campaign_votes(session, campaign_id), participation)
+
+    analytics = get_cache().get_or_set(ANALYTICS, campaign_id, load)
+    return negotiate(request, analytics.model_dump(mode="json"))
 
-    events = get_campaign_event_options(session, campaign_id)
-    votes = session.exec(select(Vote).where(Vote.campaign_id == campaign_id)).all()
-    return build_team_analytics(events, votes)
+
+@router.get("/{campaign_id}/leaderboard", response_model=Leaderboard)
+def get_campaign_leaderboard(
+    request: Request,
+    campaign_id: str,
+    limit: int = Query(DEFAULT_TOP_K, ge=1, le=100),
+    session: Session = Depends(get_session),
+) -> Response:
+    def load() -> Leaderboard:
+        campaign = _get_campaign_or_404(session, campaign_id)
+        # The full ranking is bounded by the linked events; cache it once and cut per request
+        return Leaderboard(
+            campaign_id=campaign_id,
+            winning_event_id=campaign.winning_event_id,
+            entries=load_leaderboard(session, campaign_id, top_k=None),
+        )
+
+    leaderboard = get_cache().get_or_set(ANALYTICS, leaderboard_key(campaign_id), load)
+    top = leaderboard.model_copy(update={"entries": leaderboard.entries[:limit]})
+    return negotiate(request, top.model_dump(mode="json"))
+
+
+@router.post("/{campaign_id}/winner", response_model=CampaignRead, status_code=status.HTTP_200_OK)
+def determine_winner(
+    campaign_id: str,
+    session: Session = Depends(get_session),
+) -> CampaignRead:
+    """Set winning_event_id to the top of the leaderboard."""
+    campaign = _get_campaign_or_404(session, campaign_id)
+    winner = pick_winner(session, campaign_id)
+    if winner is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No votes to determine a winner")
+
+    campaign.winning_event_id = winner.event_id
+    session.add(campaign)
+    session.commit()
+    session.refresh(campaign)
+    invalidate_campaign(campaign_id)
+    invalidate_department(campaign.dept_code)
+    return hydrate_campaign(session, campaign)
+
+
+@router.get("/{campaign_id}/activity", response_model=CampaignActivity)
+def get_campaign_activity(
+    request: Request,
+    campaign_id: str,
+    granularity: str = Query("minute", pattern="^(minute|hour)$"),
+    since: Optional[datetime] = Query(None, description="Only buckets starting at or after this time (UTC)"),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Votes and private contributions per minute or hour, with running totals."""
+    campaign = _get_campaign_or_404(session, campaign_id)
+    now = datetime.utcnow()
+    activity = CampaignActivity(
+        campaign_id=campaign_id,
+        granularity=granularity,
+        base_funding=campaign.company_budget_available + campaign.external_sponsors,
+        votes=vote_activity(session, campaign_id, granularity, now, since),
+        funding=funding_activity(session, campaign_id, granularity, now, since),
+    )
+    return negotiate(request, activity.model_dump(mode="json"))
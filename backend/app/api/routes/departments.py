@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from sqlmodel import Session
+
+from app.core.cache import get_cache
+from app.core.database import get_session
+from app.core.limiter import limiter
+from app.core.responses import ORJSONRoute, negotiate
+from app.schemas.domain import DepartmentAnalytics, DepartmentDashboard
+from app.services.caching import ANALYTICS, DEPARTMENT, DEPARTMENT_ROLLUP
+from app.services.dashboard import build_department_dashboard
+from app.services.export import EXPORT_PAGE_SIZE, buffered, gzip_stream, iter_department_export, validate_export_cursor
+from app.services.rollups import build_department_analytics
+
+
+router = APIRouter(prefix="/departments", tags=["departments"], route_class=ORJSONRoute)
+
+
+@router.get("/analytics", response_model=DepartmentAnalytics)
+def get_department_analytics(
+    request: Request,
+    session: Session = Depends(get_session),
+) -> Response:
+    """
+    Persona, category focus and outdoor wish per department and company-wide.
+
+    All departments are scored in one batch (see app.services.rollups); the result is
+    cached until the next vote or catalog change.
+    """
+    analytics = get_cache().get_or_set(ANALYTICS, DEPARTMENT_ROLLUP, lambda: build_department_analytics(session))
+    return negotiate(request, analytics.model_dump(mode="json"))
+
+
+@router.get("/{dept_code}/dashboard", response_model=DepartmentDashboard)
+def get_department_dashboard(
+    request: Request,
+    dept_code: str,
+    deadlines: int = Query(5, ge=0, le=50, description="Number of upcoming voting deadlines"),
+    session: Session = Depends(get_session),
+) -> Response:
+    """
+    Campaign counts by status, funding, upcoming voting deadlines, participation and
+    top events of a department in one response (see app.services.dashboard).
+
+    Cached per department until one of its campaigns changes.
+    """
+    dept_code = dept_code.strip().upper()
+    dashboard = get_cache().get_or_set(DEPARTMENT, dept_code, lambda: build_department_dashboard(session, dept_code))
+    now = datetime.utcnow()
+    upcoming = [d for d in dashboard.upcoming_deadlines if d.voting_deadline >= now][:deadlines]
+    return negotiate(request, dashboard.model_copy(update={"upcoming_deadlines": upcoming}).model_dump(mode="json"))
+
+
+@router.get("/{dept_code}/export")
+@limiter.limit("5/minute")
+def export_department(
+    request: Request,
+    dept_code: str,
+    cursor: Optional[str] = Query(None, description="Cursor of the last checkpoint line to resume from"),
+    gzip: bool = Query(False, description="Return a gzip-compressed .ndjson.gz file"),
+    page_size: int = Query(EXPORT_PAGE_SIZE, ge=1, le=1000, description="Campaigns per checkpoint"),
+) -> StreamingResponse:
+    """
+    Stream all campaigns, votes, availability and contributions of a department as NDJSON.
+
+    Memory stays constant regardless of department size (see app.services.export).
+    user_id and session_id are replaced by a participant pseudonym.
+    Checkpoint lines carry the cursor to resume an interrupted export.
+    """
+    dept_code = dept_code.strip().upper()
+    try:
+        validate_export_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # The generator opens its own session: yield dependencies are closed before streaming
+    chunks = buffered(iter_department_export(dept_code, cursor, page_size))
+    filename = f"{dept_code.lower()}-export.ndjson"
+    if gzip:
+        return StreamingResponse(
+            gzip_stream(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.gz"'},
+        )
+    return StreamingResponse(
+        chunks,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,22 +1,75 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlmodel import Session, select
 
+from app.core.cache import get_cache
 from app.core.database import get_session
-from app.models import EventOption
+from app.core.pagination import NEXT_CURSOR_HEADER, apply_keyset, split_page
+from app.core.responses import ORJSONRoute, negotiate, with_etag
+from app.models import EventCategory, EventOption
 from app.schemas.domain import EventOptionRead
+from app.services.caching import CATALOG
+from app.services.features import PRICE_BUCKETS, get_feature_index
 
 
-router = APIRouter(prefix="/event-options", tags=["events"])
+router = APIRouter(prefix="/event-options", tags=["events"], route_class=ORJSONRoute)
 
 
 @router.get("", response_model=List[EventOptionRead])
 def list_event_options(
+    request: Request,
     region: Optional[str] = Query(None, description="Region code filter"),
+    category: Optional[EventCategory] = Query(None, description="Category filter"),
+    tags: Optional[str] = Query(None, description="Comma-separated tags, all required (case-insensitive)"),
+    max_price_bucket: Optional[int] = Query(
+        None, ge=0, le=len(PRICE_BUCKETS), description="Price per person: 0 <=25€, 1 <=50€, 2 <=100€, 3 <=200€, 4 any"
+    ),
+    group_size: Optional[int] = Query(None, ge=1, description="Only events recommended for this group size"),
+    max_intensity: Optional[int] = Query(None, ge=1, le=5, description="Maximum physical intensity"),
+    min_social: Optional[int] = Query(None, ge=1, le=5, description="Minimum social interaction level"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for the whole catalog"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
     session: Session = Depends(get_session),
-) -> List[EventOptionRead]:
-    stmt = select(EventOption)
-    if region:
-        stmt = stmt.where(EventOption.location_region == region)
-    return list(session.exec(stmt).all())
+) -> Response:
+    """
+    List the event catalog in stable (location_region, title, id) order.
+
+    With limit= the response is one page and the X-Next-Cursor header continues it.
+    Pages are serialized once per catalog version and carry an ETag.
+    Feature filters are answered from the event feature index (app.services.features).
+    Accept: application/msgpack returns the same page MessagePack-encoded.
+    """
+    order = (EventOption.location_region, EventOption.title, EventOption.id)
+
+    tag_list = [t for t in (tags or "").split(",") if t.strip()]
+    filters = {
+        "category": category.value if category else None,
+        "tags": tag_list,
+        "max_price_bucket": max_price_bucket,
+        "group_size": group_size,
+        "max_intensity": max_intensity,
+        "min_social": min_social,
+    }
+    filtered = any(value for value in filters.values()) or max_price_bucket is not None
+
+    def load() -> Tuple[List[dict], Optional[str]]:
+        stmt = select(EventOption)
+        if region:
+            stmt = stmt.where(EventOption.location_region == region)
+        if filtered:
+            stmt = stmt.where(EventOption.id.in_(get_feature_index().filter(**filters)))
+        try:
+            stmt = apply_keyset(stmt, order, cursor, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        events, next_cursor = split_page(
+            session.exec(stmt).all(), limit, key=lambda e: (e.location_region, e.title, e.id)
+        )
+        return [EventOptionRead.model_validate(e).model_dump(mode="json") for e in events], next_cursor
+
+    key = f"{region or '*'}|{cursor}|{limit}"
+    if filtered:
+        key += "|" + "|".join(f"{name}={value}" for name, value in sorted(filters.items()))
+    events, next_cursor = get_cache().get_or_set(CATALOG, key, load, ttl=300)
+    return with_etag(negotiate(request, events, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None))
@@ -1,6 +1,11 @@
 from fastapi import APIRouter
 
-router = APIRouter(tags=["health"])
+from app.core.cache import get_cache
+from app.core.compression import compression_stats
+from app.core.responses import ORJSONRoute
+from app.services.caching import campaign_ids, room_tokens
+
+router = APIRouter(tags=["health"], route_class=ORJSONRoute)
 
 
 @router.get("/")
@@ -11,3 +16,12 @@ def root() -> dict:
 @router.get("/health")
 def health_check() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/health/metrics")
+def metrics() -> dict:
+    return {
+        "cache": get_cache().metrics(),
+        "lookups": {"campaign": campaign_ids.metrics(), "room": room_tokens.metrics()},
+        "compression": compression_stats.snapshot(),
+    }
@@ -2,11 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session
 
 from app.core.database import get_session
+from app.core.responses import ORJSONRoute
 from app.models import Campaign, Room
 from app.schemas.domain import RoomCreate, RoomRead
+from app.services.caching import campaign_ids, room_tokens
 
 
-router = APIRouter(prefix="/rooms", tags=["rooms"])
+router = APIRouter(prefix="/rooms", tags=["rooms"], route_class=ORJSONRoute)
 
 
 @router.post("", response_model=RoomRead, status_code=status.HTTP_201_CREATED)
@@ -18,6 +20,7 @@ def create_room(
     session.add(room)
     session.commit()
     session.refresh(room)
+    room_tokens.record_created(room.token)
     return room
 
 
@@ -26,12 +29,19 @@ def get_room(
     room_token: str,
     session: Session = Depends(get_session),
 ) -> RoomRead:
+    # Stale QR codes and scanners: reject unknown tokens without touching the database
+    if room_tokens.known_missing(room_token):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
     room = session.get(Room, room_token)
     if not room:
+        room_tokens.record_missing(room_token)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
     # Optionally validate campaign exists
     if room.campaign_id:
+        if campaign_ids.known_missing(room.campaign_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found for room")
         campaign = session.get(Campaign, room.campaign_id)
         if not campaign:
+            campaign_ids.record_missing(room.campaign_id)
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found for room")
     return room
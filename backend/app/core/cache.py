@@ -0,0 +1,602 @@
+"""
+Pluggable cache layer for catalog, campaign and analytics reads.
+
+Backends (selected via CACHE_BACKEND):
+- memory:  in-process LRU with TTL. Fast, but every uvicorn worker has its own copy.
+- sqlite:  on-disk cache file shared by all workers on the same host.
+- network: small line-based TCP protocol; CacheServer is a local stand-in server
+           (python -m scripts.cache_server) until a real shared cache is deployed.
+
+Cross-worker invalidation uses namespace generations: entries are stored together
+with the generation of their namespace, and invalidate(namespace) bumps that
+generation in the shared store. All old entries of the namespace become invisible
+to every worker at once without having to enumerate them.
+
+get_or_set() coalesces concurrent misses for the same key through SingleFlight,
+so an expired hot entry is recomputed once per process instead of once per
+request (cache stampede protection). Before calling the factory it takes a write
+token: the namespace generation plus the backend's delete sequence. delete()
+leaves a tombstone carrying the next sequence number, and a guarded set() is
+skipped if the namespace was invalidated or the key deleted after the token was
+taken. A value computed from data read before a write therefore never
+overwrites the invalidation of that write. Tombstones are bounded (oldest
+dropped first); a token older than the newest dropped tombstone never writes.
+
+Metrics (hits, misses, sets, deletes, invalidations, evictions, coalesced) are
+collected per namespace and per process.
+"""
+import hashlib
+import hmac
+import logging
+import pickle
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from .config import get_settings
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CacheStats:
+    """Per-namespace counters, kept per process."""
+
+    FIELDS = ("hits", "misses", "sets", "deletes", "invalidations", "evictions", "coalesced")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def incr(self, namespace: str, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[namespace][field] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for namespace, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                result[namespace] = {
+                    **counters,
+                    "hit_ratio": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+                }
+            return result
+
+
+class CacheBackend:
+    """
+    Base class for all cache backends.
+
+    Subclasses implement the _get/_set/_delete/_invalidate/_generation/_write_token
+    primitives; metrics are recorded here so every backend reports them the same way.
+    Values returned from the cache must be treated as read-only.
+    """
+
+    name = "base"
+
+    def __init__(self, default_ttl: float = 60) -> None:
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self.flights = SingleFlight()
+
+    # Public API -----------------------------------------------------------
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        value = self._get(namespace, key)
+        if value is _MISSING:
+            self.stats.incr(namespace, "misses")
+            return default
+        self.stats.incr(namespace, "hits")
+        return value
+
+    def set(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None, token: Optional[Tuple[int, int]] = None
+    ) -> bool:
+        """
+        Store a value; with a write token, only if neither invalidate(namespace) nor
+        delete(namespace, key) ran since the token was taken.
+
+        Returns whether the value was stored.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        stored = self._set(namespace, key, value, ttl, token)
+        if stored:
+            self.stats.incr(namespace, "sets")
+        return stored
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._delete(namespace, key)
+        self.stats.incr(namespace, "deletes")
+
+    def invalidate(self, namespace: str) -> None:
+        """Drop every entry of a namespace, in all workers sharing this backend."""
+        self._invalidate(namespace)
+        self.stats.incr(namespace, "invalidations")
+
+    def generation(self, namespace: str) -> int:
+        """Current generation of a namespace; changes whenever it is invalidated."""
+        return self._generation(namespace)
+
+    def write_token(self, namespace: str, key: str) -> Optional[Tuple[int, int]]:
+        """(namespace generation, delete sequence) to guard a later set(); None if unavailable."""
+        return self._write_token(namespace, key)
+
+    def get_or_set(self, namespace: str, key: str, factory: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value or compute it with factory().
+
+        Concurrent misses for the same key share a single factory() call; exceptions
+        (e.g. a 404 HTTPException) propagate to every waiting caller.
+        """
+        value = self.get(namespace, key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def compute() -> Any:
+            # Another flight may have filled the entry between our miss and now
+            cached = self._get(namespace, key)
+            if cached is not _MISSING:
+                return cached
+            token = self._write_token(namespace, key)
+            computed = factory()
+            # Skipped if invalidate() or delete() ran while factory() was reading
+            if token is not None:
+                self.set(namespace, key, computed, ttl, token)
+            return computed
+
+        value, shared = self.flights.do(f"{namespace}\0{key}", compute)
+        if shared:
+            self.stats.incr(namespace, "coalesced")
+        return value
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "in_flight": self.flights.in_flight(),
+            "namespaces": self.stats.snapshot(),
+        }
+
+    # Backend primitives ---------------------------------------------------
+
+    def _get(self, namespace: str, key: str) -> Any:
+        raise NotImplementedError
+
+    def _set(self, namespace: str, key: str, value: Any, ttl: float, token: Optional[Tuple[int, int]] = None) -> bool:
+        raise NotImplementedError
+
+    def _delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    def _invalidate(self, namespace: str) -> None:
+        raise NotImplementedError
+
+    def _generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    def _write_token(self, namespace: str, key: str) -> Optional[Tuple[int, int]]:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with per-entry TTL. Not shared between workers."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 2048, default_ttl: float = 60) -> None:
+        super().__init__(default_ttl)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = defaultdict(int)
+        # Tombstones of deleted keys: (namespace, key) -> delete sequence number
+        self._deleted: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._delete_seq = 0
+        self._delete_floor = 0  # newest sequence number dropped from _deleted
+
+    def _get(self, namespace: str, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return _MISSING
+            generation, expires_at, value = entry
+            if generation != self._generations[namespace] or expires_at <= time.monotonic():
+                del self._entries[(namespace, key)]
+                return _MISSING
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def _set(self, namespace: str, key: str, value: Any, ttl: float, token: Optional[Tuple[int, int]] = None) -> bool:
+        with self._lock:
+            current = self._generations[namespace]
+            if token is not None:
+                generation, seq = token
+                if generation != current or seq < self._delete_floor or self._deleted.get((namespace, key), 0) > seq:
+                    return False
+            self._entries[(namespace, key)] = (current, time.monotonic() + ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                (evicted_ns, _), _ = self._entries.popitem(last=False)
+                self.stats.incr(evicted_ns, "evictions")
+            return True
+
+    def _delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+            self._delete_seq += 1
+            self._deleted[(namespace, key)] = self._delete_seq
+            self._deleted.move_to_end((namespace, key))
+            while len(self._deleted) > self.max_entries:
+                _, self._delete_floor = self._deleted.popitem(last=False)
+
+    def _invalidate(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] += 1
+
+    def _generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations[namespace]
+
+    def _write_token(self, namespace: str, key: str) -> Optional[Tuple[int, int]]:
+        with self._lock:
+            return self._generations[namespace], self._delete_seq
+
+
+class SQLiteCache(CacheBackend):
+    """
+    On-disk cache shared by all worker processes on one host.
+
+    Uses its own SQLite file (WAL mode) so cache traffic never contends with the
+    application database. Values are pickled. Tombstones of deleted keys live in
+    cache_tombstone, numbered by cache_clock.delete_seq.
+    """
+
+    name = "sqlite"
+    _PRUNE_EVERY = 256
+
+    def __init__(self, path: str, max_entries: int = 2048, default_ttl: float = 60) -> None:
+        super().__init__(default_ttl)
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._write_count = 0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, generation INTEGER NOT NULL, "
+                "value BLOB NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_namespace ("
+                "namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entry_expires_at ON cache_entry (expires_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_tombstone ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, seq INTEGER NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_tombstone_seq ON cache_tombstone (seq)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_clock ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), delete_seq INTEGER NOT NULL, delete_floor INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO cache_clock (id, delete_seq, delete_floor) VALUES (1, 0, 0)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, namespace: str, key: str) -> Any:
+        row = self._connect().execute(
+            "SELECT e.value FROM cache_entry e "
+            "WHERE e.namespace = ? AND e.key = ? AND e.expires_at > ? "
+            "AND e.generation = COALESCE((SELECT generation FROM cache_namespace WHERE namespace = ?), 0)",
+            (namespace, key, time.time(), namespace),
+        ).fetchone()
+        if row is None:
+            return _MISSING
+        return pickle.loads(row[0])
+
+    def _set(self, namespace: str, key: str, value: Any, ttl: float, token: Optional[Tuple[int, int]] = None) -> bool:
+        conn = self._connect()
+        generation, seq = token if token is not None else (None, None)
+        # The token check and the write are one statement, so an invalidation or delete cannot slip in between
+        cursor = conn.execute(
+            "INSERT OR REPLACE INTO cache_entry (namespace, key, generation, value, expires_at) "
+            "SELECT ?, ?, g.generation, ?, ? FROM "
+            "(SELECT COALESCE((SELECT generation FROM cache_namespace WHERE namespace = ?), 0) AS generation) g, "
+            "cache_clock c "
+            "WHERE ? IS NULL OR (g.generation = ? AND ? >= c.delete_floor AND NOT EXISTS ("
+            "SELECT 1 FROM cache_tombstone t WHERE t.namespace = ? AND t.key = ? AND t.seq > ?))",
+            (
+                namespace,
+                key,
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                time.time() + ttl,
+                namespace,
+                generation,
+                generation,
+                seq,
+                namespace,
+                key,
+                seq,
+            ),
+        )
+        if cursor.rowcount == 0:
+            return False
+        self._count_write(conn)
+        return True
+
+    def _count_write(self, conn: sqlite3.Connection) -> None:
+        self._write_count += 1
+        if self._write_count % self._PRUNE_EVERY == 0:
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop expired and orphaned entries, then trim to max_entries (soonest expiry first)."""
+        conn.execute("DELETE FROM cache_entry WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cache_entry WHERE generation < "
+            "COALESCE((SELECT generation FROM cache_namespace n WHERE n.namespace = cache_entry.namespace), 0)"
+        )
+        cursor = conn.execute(
+            "DELETE FROM cache_entry WHERE rowid IN ("
+            "SELECT rowid FROM cache_entry ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        if cursor.rowcount > 0:
+            self.stats.incr("*", "evictions", cursor.rowcount)
+        # Keep the newest max_entries tombstones; tokens older than the dropped ones never write
+        conn.execute(
+            "UPDATE cache_clock SET delete_floor = MAX(delete_floor, COALESCE("
+            "(SELECT seq FROM cache_tombstone ORDER BY seq DESC LIMIT 1 OFFSET ?), 0))",
+            (self.max_entries,),
+        )
+        conn.execute("DELETE FROM cache_tombstone WHERE seq <= (SELECT delete_floor FROM cache_clock)")
+
+    def _delete(self, namespace: str, key: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cache_entry WHERE namespace = ? AND key = ?", (namespace, key))
+            conn.execute("UPDATE cache_clock SET delete_seq = delete_seq + 1")
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_tombstone (namespace, key, seq) SELECT ?, ?, delete_seq FROM cache_clock",
+                (namespace, key),
+            )
+        self._count_write(conn)
+
+    def _invalidate(self, namespace: str) -> None:
+        self._connect().execute(
+            "INSERT INTO cache_namespace (namespace, generation) VALUES (?, 1) "
+            "ON CONFLICT(namespace) DO UPDATE SET generation = generation + 1",
+            (namespace,),
+        )
+
+    def _generation(self, namespace: str) -> int:
+        row = self._connect().execute(
+            "SELECT generation FROM cache_namespace WHERE namespace = ?", (namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _write_token(self, namespace: str, key: str) -> Optional[Tuple[int, int]]:
+        return self._connect().execute(
+            "SELECT COALESCE((SELECT generation FROM cache_namespace WHERE namespace = ?), 0), delete_seq "
+            "FROM cache_clock",
+            (namespace,),
+        ).fetchone()
+
+
+# Network protocol ---------------------------------------------------------
+#
+# Requests are a single CRLF-terminated line; SET is followed by <nbytes> bytes:
+#   GET <ns> <key>                  -> VALUE <nbytes>\r\n<bytes> | MISS
+#   SET <ns> <key> <ttl> <nbytes> [<gen> <seq>]
+#                                   -> OK | STALE (invalidated or deleted since TOK returned <gen> <seq>)
+#   DEL <ns> <key>                  -> OK
+#   INV <ns>                        -> OK
+#   GEN <ns>                        -> GEN <n>
+#   TOK <ns> <key>                  -> TOK <gen> <seq>
+# Namespaces and keys are percent-quoted so they never contain whitespace.
+
+
+class _CacheRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        store: MemoryCache = self.server.store  # type: ignore[attr-defined]
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            parts = line.decode("ascii").split()
+            if not parts:
+                continue
+            command, args = parts[0].upper(), [unquote(p) for p in parts[1:]]
+            try:
+                if command == "GET":
+                    value = store._get(args[0], args[1])
+                    if value is _MISSING:
+                        self.wfile.write(b"MISS\r\n")
+                    else:
+                        self.wfile.write(b"VALUE %d\r\n" % len(value) + value)
+                elif command == "SET":
+                    payload = self.rfile.read(int(args[3]))
+                    token = (int(args[4]), int(args[5])) if len(args) > 5 else None
+                    stored = store._set(args[0], args[1], payload, float(args[2]), token)
+                    self.wfile.write(b"OK\r\n" if stored else b"STALE\r\n")
+                elif command == "DEL":
+                    store._delete(args[0], args[1])
+                    self.wfile.write(b"OK\r\n")
+                elif command == "INV":
+                    store._invalidate(args[0])
+                    self.wfile.write(b"OK\r\n")
+                elif command == "GEN":
+                    self.wfile.write(b"GEN %d\r\n" % store._generation(args[0]))
+                elif command == "TOK":
+                    self.wfile.write(b"TOK %d %d\r\n" % store._write_token(args[0], args[1]))
+                else:
+                    self.wfile.write(b"ERR unknown command\r\n")
+            except (IndexError, ValueError):
+                self.wfile.write(b"ERR bad request\r\n")
+
+
+class CacheServer(socketserver.ThreadingTCPServer):
+    """Local stand-in cache server speaking the network protocol above."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7070, max_entries: int = 10000) -> None:
+        super().__init__((host, port), _CacheRequestHandler)
+        self.store = MemoryCache(max_entries=max_entries)
+
+    def serve_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="cache-server", daemon=True)
+        thread.start()
+        return thread
+
+
+class NetworkCache(CacheBackend):
+    """
+    Client for CacheServer (or any server speaking the same protocol).
+
+    Connection errors are logged and treated as misses: a cache outage degrades
+    to uncached reads instead of failing requests. Failed deletes and invalidations
+    are logged as errors, since other workers may keep serving the old entries.
+
+    Values are pickled and signed with HMAC-SHA256 under secret; payloads with a
+    wrong signature are never unpickled and count as misses.
+    """
+
+    name = "network"
+    _DIGEST_SIZE = hashlib.sha256().digest_size
+
+    def __init__(self, host: str, port: int, secret: str, default_ttl: float = 60, timeout: float = 0.5) -> None:
+        super().__init__(default_ttl)
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._secret = secret.encode("utf-8")
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = sock.makefile("rwb")
+            self._local.sock, self._local.conn = sock, conn
+        return conn
+
+    def _reset(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = self._local.conn = None
+
+    def _request(self, line: str, payload: bytes = b"") -> Tuple[str, bytes]:
+        try:
+            conn = self._conn()
+            conn.write(line.encode("ascii") + b"\r\n" + payload)
+            conn.flush()
+            header = conn.readline().decode("ascii").strip()
+            if not header:
+                raise ConnectionError("cache server closed connection")
+            body = b""
+            if header.startswith("VALUE "):
+                body = conn.read(int(header.split()[1]))
+            return header, body
+        except (OSError, ConnectionError, ValueError) as e:
+            logger.warning(f"Cache server {self.host}:{self.port} unavailable: {e}")
+            self._reset()
+            return "ERR unavailable", b""
+
+    def _sign(self, data: bytes) -> bytes:
+        return hmac.new(self._secret, data, hashlib.sha256).digest()
+
+    def _get(self, namespace: str, key: str) -> Any:
+        header, body = self._request(f"GET {quote(namespace, safe='')} {quote(key, safe='')}")
+        if not header.startswith("VALUE "):
+            return _MISSING
+        signature, data = body[: self._DIGEST_SIZE], body[self._DIGEST_SIZE :]
+        if not hmac.compare_digest(signature, self._sign(data)):
+            logger.error(f"Cache server {self.host}:{self.port} returned an unsigned value for {namespace}/{key}")
+            return _MISSING
+        return pickle.loads(data)
+
+    def _set(self, namespace: str, key: str, value: Any, ttl: float, token: Optional[Tuple[int, int]] = None) -> bool:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        payload = self._sign(data) + data
+        line = f"SET {quote(namespace, safe='')} {quote(key, safe='')} {ttl} {len(payload)}"
+        if token is not None:
+            line += f" {token[0]} {token[1]}"
+        header, _ = self._request(line, payload)
+        return header == "OK"
+
+    def _delete(self, namespace: str, key: str) -> None:
+        header, _ = self._request(f"DEL {quote(namespace, safe='')} {quote(key, safe='')}")
+        if header != "OK":
+            logger.error(f"Cache delete of {namespace}/{key} failed ({header}); other workers may serve stale data")
+
+    def _invalidate(self, namespace: str) -> None:
+        header, _ = self._request(f"INV {quote(namespace, safe='')}")
+        if header != "OK":
+            logger.error(f"Cache invalidation of {namespace} failed ({header}); other workers may serve stale data")
+
+    def _generation(self, namespace: str) -> int:
+        header, _ = self._request(f"GEN {quote(namespace, safe='')}")
+        return int(header.split()[1]) if header.startswith("GEN ") else 0
+
+    def _write_token(self, namespace: str, key: str) -> Optional[Tuple[int, int]]:
+        header, _ = self._request(f"TOK {quote(namespace, safe='')} {quote(key, safe='')}")
+        if not header.startswith("TOK "):
+            return None
+        _, generation, seq = header.split()
+        return int(generation), int(seq)
+
+
+def create_cache(
+    backend: str,
+    url: Optional[str] = None,
+    max_entries: int = 2048,
+    default_ttl: float = 60,
+    secret: Optional[str] = None,
+) -> CacheBackend:
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, default_ttl=default_ttl)
+    if backend == "sqlite":
+        return SQLiteCache(url or "./data/cache.db", max_entries=max_entries, default_ttl=default_ttl)
+    if backend == "network":
+        host, _, port = (url or "127.0.0.1:7070").rpartition(":")
+        return NetworkCache(
+            host or "127.0.0.1", int(port), secret or get_settings().secret_key, default_ttl=default_ttl
+        )
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+@lru_cache
+def get_cache() -> CacheBackend:
+    settings = get_settings()
+    return create_cache(
+        settings.cache_backend,
+        settings.cache_url,
+        max_entries=settings.cache_max_entries,
+        default_ttl=settings.cache_default_ttl,
+        secret=settings.secret_key,
+    )
@@ -0,0 +1,192 @@
+"""
+Response compression middleware (gzip, brotli if installed).
+
+Event option payloads are mostly long German prose and compress very well. Only
+complete (non-streaming) responses are compressed, and only when they are at least
+COMPRESSION_MINIMUM_SIZE bytes, of a compressible content type and not already
+encoded. Streaming responses pass through untouched.
+
+Responses carrying an ETag (immutable content such as catalog pages and booked
+campaigns, see app.core.responses.with_etag) have their compressed bodies cached
+per ETag and encoding, so identical bytes are not compressed again. A compressed
+body is a different representation, so its ETag gets the encoding as suffix
+('"<hash>-gzip"', '"<hash>-br"'). GET and HEAD requests whose If-None-Match
+names the ETag of the representation that would be sent get a 304 without body.
+"""
+import gzip
+import threading
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import MemoryCache
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/javascript",
+    "text/",
+)
+
+
+class CompressionStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ("responses_compressed", "responses_skipped", "cache_hits", "bytes_in", "bytes_out"), 0
+        )
+
+    def record(self, **amounts: int) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                self._counters[name] += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["bytes_saved"] = counters["bytes_in"] - counters["bytes_out"]
+        return counters
+
+
+compression_stats = CompressionStats()
+
+
+def _encoded_etag(etag: str, encoding: str) -> str:
+    weak, opaque = ("W/", etag[2:]) if etag.startswith("W/") else ("", etag)
+    return f'{weak}{opaque[:-1]}-{encoding}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110, 13.1.2)
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == target:
+            return True
+    return False
+
+
+def _not_modified(start_message: Message) -> Message:
+    headers = [
+        (k, v)
+        for k, v in start_message["headers"]
+        if k.lower() not in (b"content-length", b"content-type", b"content-encoding")
+    ]
+    return {**start_message, "status": 304, "headers": headers}
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compresslevel: int = 6,
+        cache_entries: int = 256,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.cache = MemoryCache(max_entries=cache_entries, default_ttl=3600)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = _choose_encoding(request_headers.get("accept-encoding", ""))
+        if_none_match = request_headers.get("if-none-match") if scope["method"] in ("GET", "HEAD") else None
+        if encoding is None and not if_none_match:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            assert start_message is not None
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                passthrough = True
+                if encoding is not None:
+                    compression_stats.record(responses_skipped=1)
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            etag = headers.get("etag")
+            compress = encoding is not None and self._compressible(start_message, body)
+            if compress and etag:
+                headers["ETag"] = _encoded_etag(etag, encoding)
+            if compress:
+                headers.add_vary_header("Accept-Encoding")
+            if if_none_match and etag and start_message["status"] == 200 and _etag_matches(if_none_match, headers["etag"]):
+                await send(_not_modified(start_message))
+                await send({"type": "http.response.body", "body": b""})
+                return
+            if not compress:
+                if encoding is not None:
+                    compression_stats.record(responses_skipped=1)
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = self._compress(body, encoding, etag)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compressible(self, start_message: Message, body: bytes) -> bool:
+        if len(body) < self.minimum_size:
+            return False
+        headers = Headers(raw=start_message["headers"])
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compress(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        if etag:
+            cached = self.cache.get(encoding, etag)
+            if cached is not None:
+                compression_stats.record(responses_compressed=1, cache_hits=1, bytes_in=len(body), bytes_out=len(cached))
+                return cached
+
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=min(self.compresslevel, 11))
+        else:
+            compressed = gzip.compress(body, compresslevel=self.compresslevel, mtime=0)
+
+        if etag:
+            self.cache.set(encoding, etag, compressed)
+        compression_stats.record(responses_compressed=1, bytes_in=len(body), bytes_out=len(compressed))
+        return compressed
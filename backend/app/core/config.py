@@ -20,6 +20,23 @@ class Settings(BaseSettings):
     openrouter_api_key: Optional[str] = None
     llm_model: Optional[str] = None
 
+    # Cache layer: "memory" (per worker), "sqlite" (shared file) or "network" (host:port)
+    cache_backend: str = "memory"
+    cache_url: Optional[str] = None
+    cache_max_entries: int = 2048
+    cache_default_ttl: int = 60
+    # Reject unknown campaign ids / room tokens via Bloom filter (needs a shared cache with >1 worker)
+    negative_lookup_bloom: bool = True
+    # Campaign list assembly: "python" (Core row projections) or "sqlite_json" (json_object in SQLite)
+    campaign_read_engine: str = "python"
+
+    # Response compression (gzip, or brotli if the package is installed)
+    compression_minimum_size: int = 1024
+    compression_level: int = 6
+
+    # Participation rates: headcount of departments without headcount or user profiles
+    default_department_headcount: int = 20
+
     # Environment detection
     environment: str = "development"  # development, staging, production
 
@@ -1,6 +1,7 @@
+import json
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Optional
 
 from sqlmodel import Session, SQLModel, create_engine, select
 
@@ -1121,12 +1122,130 @@ def _ensure_voting_deadline_column() -> None:
             )
 
 
+def _ensure_department_headcount_column() -> None:
+    """Ensure new column exists on sqlite without a full migration system."""
+    if not settings.database_url.startswith("sqlite"):
+        return
+    with engine.begin() as conn:
+        cols = conn.exec_driver_sql("PRAGMA table_info(department);").fetchall()
+        names = {c[1] for c in cols}
+        if "headcount" not in names:
+            conn.exec_driver_sql(
+                "ALTER TABLE department ADD COLUMN headcount INTEGER;"
+            )
+
+
+def _ensure_campaign_funding_columns() -> None:
+    """Add and backfill the campaign's running contribution aggregates (sqlite only)."""
+    if not settings.database_url.startswith("sqlite"):
+        return
+    from app.services.budget import rebuild_funding_aggregates  # local import to avoid circular deps
+
+    with engine.begin() as conn:
+        cols = conn.exec_driver_sql("PRAGMA table_info(campaign);").fetchall()
+        names = {c[1] for c in cols}
+        if "private_total" in names:
+            return
+        conn.exec_driver_sql("ALTER TABLE campaign ADD COLUMN private_total FLOAT NOT NULL DEFAULT 0;")
+        conn.exec_driver_sql("ALTER TABLE campaign ADD COLUMN contribution_count INTEGER NOT NULL DEFAULT 0;")
+        conn.exec_driver_sql("ALTER TABLE campaign ADD COLUMN max_contribution FLOAT;")
+        conn.exec_driver_sql("ALTER TABLE campaign ADD COLUMN first_contribution_id VARCHAR;")
+    with Session(engine) as session:
+        rebuild_funding_aggregates(session)
+        session.commit()
+
+
+def _ensure_availability_slot_mask() -> None:
+    """Replace the JSON availability.slots column by the slot_mask bitmask (sqlite only)."""
+    if not settings.database_url.startswith("sqlite"):
+        return
+    from app.services.availability import SLOT_BITS, slots_to_mask  # local import to avoid circular deps
+
+    def to_mask(slots: Optional[str]) -> int:
+        # Stored rows predate slot validation: drop unknown names
+        return slots_to_mask([slot for slot in (json.loads(slots) if slots else []) if slot in SLOT_BITS])
+
+    with engine.begin() as conn:
+        cols = conn.exec_driver_sql("PRAGMA table_info(availability);").fetchall()
+        names = {c[1] for c in cols}
+        if "slots" not in names:
+            return
+        if "slot_mask" not in names:
+            conn.exec_driver_sql(
+                "ALTER TABLE availability ADD COLUMN slot_mask INTEGER NOT NULL DEFAULT 0;"
+            )
+        rows = conn.exec_driver_sql("SELECT id, slots FROM availability;").fetchall()
+        if rows:
+            conn.exec_driver_sql(
+                "UPDATE availability SET slot_mask = ? WHERE id = ?;",
+                [(to_mask(slots), row_id) for row_id, slots in rows],
+            )
+        conn.exec_driver_sql("ALTER TABLE availability DROP COLUMN slots;")
+
+
+def _ensure_indexes() -> None:
+    """Create indexes added to existing tables (create_all only indexes new tables)."""
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def _ensure_vote_tally() -> None:
+    """Backfill campaign_event_tally for databases that have votes but no tally yet."""
+    from app.models import CampaignEventTally, Vote
+    from app.services.tally import rebuild_tally  # local import to avoid circular deps
+
+    with Session(engine) as session:
+        if session.exec(select(CampaignEventTally.campaign_id).limit(1)).first() is not None:
+            return
+        if session.exec(select(Vote.id).limit(1)).first() is None:
+            return
+        rebuild_tally(session)
+        session.commit()
+
+
+def _ensure_voter_sketches() -> None:
+    """Backfill campaign_voter_sketch for databases that have votes but no sketches yet."""
+    from app.models import CampaignVoterSketch, Vote
+    from app.services.participation import rebuild_voter_sketches  # local import to avoid circular deps
+
+    with Session(engine) as session:
+        if session.exec(select(CampaignVoterSketch.campaign_id).limit(1)).first() is not None:
+            return
+        if session.exec(select(Vote.id).limit(1)).first() is None:
+            return
+        rebuild_voter_sketches(session)
+        session.commit()
+
+
+def _ensure_availability_tally() -> None:
+    """Backfill the availability tally and participant counts for databases that have availability but no counts yet."""
+    from app.models import Availability, CampaignAvailabilityParticipants
+    from app.services.availability import rebuild_availability_tally  # local import to avoid circular deps
+
+    with Session(engine) as session:
+        if session.exec(select(CampaignAvailabilityParticipants.campaign_id).limit(1)).first() is not None:
+            return
+        if session.exec(select(Availability.id).limit(1)).first() is None:
+            return
+        rebuild_availability_tally(session)
+        session.commit()
+
+
 def init_db() -> None:
     """Create database tables. Call this once at startup."""
     from app import models  # noqa: F401 - triggers model registration
 
     SQLModel.metadata.create_all(bind=engine)
     _ensure_voting_deadline_column()
+    _ensure_department_headcount_column()
+    _ensure_campaign_funding_columns()
+    _ensure_availability_slot_mask()
+    _ensure_indexes()
+    _ensure_vote_tally()
+    _ensure_voter_sketches()
+    _ensure_availability_tally()
     with Session(engine) as session:
         seed_event_options(session)
 
@@ -0,0 +1,203 @@
+"""
+Negative-lookup protection for primary-key reads.
+
+Scanners and stale QR codes produce a steady stream of requests for campaign ids
+and room tokens that do not exist. ExistenceIndex rejects most of them without
+touching the database:
+
+1. A Bloom filter of all existing keys, built at startup. "Definitely absent"
+   answers are returned as 404 immediately; false positives (~1%) fall through.
+2. A bounded LRU of keys that recently missed in the database (negative cache),
+   which catches repeated requests for those false positives.
+
+Creating a key adds it to the local filter and bumps the index generation in the
+shared cache backend. Before answering "absent", a worker compares its generation
+with the shared one, at most once per check_interval (the check is a query or a
+round trip on the sqlite and network backends), and on a change adds only the
+keys created since its last sync (loader(since)) to its filter. The filter is
+rebuilt from scratch only once it holds more keys than it was sized for. A key
+created by another worker may therefore be reported missing for up to
+check_interval. With CACHE_BACKEND=memory generations are per process; run
+several workers only together with a shared cache backend or disable the filter
+(NEGATIVE_LOOKUP_BLOOM=false).
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .cache import get_cache
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Keys are stamped with created_at before their transaction commits; catching up
+# from a little before the last sync covers rows that committed late
+CATCH_UP_MARGIN = timedelta(seconds=60)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Kirsch-Mitzenmacher double hashing over one 128-bit digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class ExistenceIndex:
+    """
+    Bloom filter plus bounded negative cache for one kind of primary key.
+
+    loader(since) returns the keys created at or after since (UTC), or all keys
+    for since=None.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        loader: Callable[[Optional[datetime]], Iterable[str]],
+        max_negative: int = 10000,
+        negative_ttl: float = 300,
+        check_interval: float = 1.0,
+    ) -> None:
+        self.kind = kind
+        self.namespace = f"exists:{kind}"
+        self.loader = loader
+        self.max_negative = max_negative
+        self.negative_ttl = negative_ttl
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        self._generation: Optional[int] = None
+        self._synced_at: Optional[datetime] = None
+        self._checked_at = 0.0
+        self._negative: "OrderedDict[str, float]" = OrderedDict()
+        self._counters = dict.fromkeys(
+            ("bloom_rejections", "negative_hits", "db_misses", "rebuilds", "catch_ups", "generation_checks"), 0
+        )
+        self._size = 0
+
+    @property
+    def bloom_enabled(self) -> bool:
+        return get_settings().negative_lookup_bloom
+
+    def rebuild(self) -> None:
+        generation = get_cache().generation(self.namespace)
+        synced_at = datetime.utcnow()
+        keys: List[str] = list(self.loader(None))
+        bloom = BloomFilter(capacity=max(1024, len(keys) * 2))
+        for key in keys:
+            bloom.add(key)
+        with self._lock:
+            self._bloom, self._generation, self._size = bloom, generation, len(keys)
+            self._synced_at, self._checked_at = synced_at, time.monotonic()
+            self._counters["rebuilds"] += 1
+        logger.info(f"Existence index '{self.kind}' rebuilt with {len(keys)} keys")
+
+    def catch_up(self) -> None:
+        """Add the keys created since the last sync; rebuild once the filter is over capacity."""
+        if self._synced_at is None:
+            self.rebuild()
+            return
+        generation = get_cache().generation(self.namespace)
+        synced_at = datetime.utcnow()
+        keys = list(self.loader(self._synced_at - CATCH_UP_MARGIN))
+        with self._lock:
+            for key in keys:
+                self._add(key)
+            self._generation, self._synced_at = generation, synced_at
+            self._counters["catch_ups"] += 1
+            full = self._size > self._bloom.capacity
+        if full:
+            self.rebuild()
+
+    def _refresh(self) -> None:
+        """Catch up if the shared generation moved; checked at most once per check_interval."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        cache = get_cache()
+        with self._lock:
+            self._counters["generation_checks"] += 1
+        if self._generation != cache.generation(self.namespace):
+            cache.flights.do(self.namespace, self.catch_up)
+
+    def known_missing(self, key: str) -> bool:
+        """True if key certainly (bloom) or very recently (negative cache) did not exist."""
+        if self.bloom_enabled:
+            if self._bloom is None:
+                get_cache().flights.do(self.namespace, self.rebuild)
+            # Only an "absent" answer can be stale, so only that one checks the generation
+            if key not in self._bloom:
+                self._refresh()
+            if key not in self._bloom:
+                with self._lock:
+                    self._counters["bloom_rejections"] += 1
+                return True
+
+        with self._lock:
+            expires_at = self._negative.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._negative[key]
+                return False
+            self._negative.move_to_end(key)
+            self._counters["negative_hits"] += 1
+            return True
+
+    def record_missing(self, key: str) -> None:
+        """Remember a key the database did not know."""
+        with self._lock:
+            self._counters["db_misses"] += 1
+            self._remember_missing(key)
+
+    def record_created(self, key: str) -> None:
+        with self._lock:
+            self._negative.pop(key, None)
+            if self._bloom is not None:
+                self._add(key)
+        # Tells other workers to catch up; entries of the namespace are never read
+        get_cache().invalidate(self.namespace)
+
+    def record_deleted(self, key: str) -> None:
+        # Bloom filters cannot remove keys; the negative cache answers until the next rebuild
+        with self._lock:
+            self._remember_missing(key)
+
+    def _add(self, key: str) -> None:
+        # Catch-ups overlap by CATCH_UP_MARGIN; count each key once (up to false positives)
+        if key not in self._bloom:
+            self._bloom.add(key)
+            self._size += 1
+
+    def _remember_missing(self, key: str) -> None:
+        self._negative[key] = time.monotonic() + self.negative_ttl
+        self._negative.move_to_end(key)
+        while len(self._negative) > self.max_negative:
+            self._negative.popitem(last=False)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "keys": self._size, "negative_entries": len(self._negative)}
@@ -0,0 +1,76 @@
+"""
+HyperLogLog distinct counter.
+
+A sketch of 2**precision one-byte registers estimates the number of distinct
+values added to it with a standard error of about 1.04 / sqrt(2**precision)
+(1.6 % at the default precision 12, i.e. 4 KiB). Sketches of the same precision
+merge by taking the register-wise maximum, so distinct counts over any union of
+sketches (e.g. all campaigns of a department) cost O(registers), not O(values).
+Small cardinalities use linear counting and are practically exact.
+"""
+import hashlib
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+
+DEFAULT_PRECISION = 12
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytes] = None) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is None:
+            self.registers = np.zeros(self.size, dtype=np.uint8)
+        else:
+            if len(registers) != self.size:
+                raise ValueError("register count does not match precision")
+            self.registers = np.frombuffer(registers, dtype=np.uint8).copy()
+
+    def add(self, value: str) -> bool:
+        """Add a value; True if the sketch changed."""
+        hashed = _hash64(value)
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def update(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @classmethod
+    def union(cls, sketches: Iterable["HyperLogLog"], precision: int = DEFAULT_PRECISION) -> "HyperLogLog":
+        merged = cls(precision)
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    def count(self) -> int:
+        m = self.size
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if zeros == m:
+            return 0
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return self.registers.tobytes()
@@ -0,0 +1,69 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are ordered by a unique column tuple, e.g. (created_at, id). The cursor is
+the opaque, URL-safe encoding of the last row's key; the next page continues with
+WHERE (created_at, id) > (:created_at, :id) on a matching composite index, so the
+cost per page stays constant no matter how deep the client pages.
+"""
+import base64
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import orjson
+from sqlalchemy import DateTime, literal, tuple_
+from sqlalchemy.sql import Select
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(list(values))).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Decode a cursor for the given key columns. Raises ValueError if malformed."""
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+    decoded = []
+    for value, column in zip(values, columns):
+        # Key columns are strings or datetimes (encoded as ISO strings)
+        if value is None and column.expression.nullable:
+            decoded.append(None)
+            continue
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+        if isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)  # ValueError if malformed
+        decoded.append(value)
+    return decoded
+
+
+def apply_keyset(stmt: Select, columns: Sequence[Any], cursor: Optional[str], limit: Optional[int]) -> Select:
+    """
+    Order stmt by the key columns and continue after cursor.
+
+    Fetches limit + 1 rows so split_page can tell whether another page exists.
+    """
+    stmt = stmt.order_by(*columns)
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        stmt = stmt.where(tuple_(*columns) > tuple_(*(literal(v, type_=c.type) for v, c in zip(values, columns))))
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def split_page(rows: Sequence[T], limit: Optional[int], key: Callable[[T], Tuple[Any, ...]]) -> Tuple[List[T], Optional[str]]:
+    """Cut the extra row fetched by apply_keyset and build the next cursor."""
+    rows = list(rows)
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([v.isoformat() if isinstance(v, datetime) else v for v in key(rows[-1])])
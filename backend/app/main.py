@@ -4,10 +4,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from app.api.routes import campaigns, events, health, rooms
+from app.api.routes import campaigns, departments, events, health, rooms
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
 from app.core.database import init_db
 from app.core.limiter import limiter
+from app.core.responses import ORJSONResponse
+from app.services.caching import campaign_ids, room_tokens
 
 # Configure logging
 logging.basicConfig(
@@ -17,7 +20,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
-app = FastAPI(title=settings.project_name)
+app = FastAPI(title=settings.project_name, default_response_class=ORJSONResponse)
 
 # Rate limiting
 app.state.limiter = limiter
@@ -36,10 +39,17 @@ app.add_middleware(
         "Origin",
         "X-Requested-With",
     ],
-    expose_headers=["Content-Length", "X-Request-ID"],
+    expose_headers=["Content-Length", "X-Request-ID", "X-Next-Cursor"],
     max_age=600,  # 10 minutes
 )
 
+# Compress large JSON/text responses (mostly long German event descriptions)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    compresslevel=settings.compression_level,
+)
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     logger.info(f"Request: {request.method} {request.url}")
@@ -57,9 +67,13 @@ def on_startup() -> None:
     logger.info("Starting up application...")
     init_db()
     logger.info("Database initialized.")
+    if settings.negative_lookup_bloom:
+        campaign_ids.rebuild()
+        room_tokens.rebuild()
 
 
 app.include_router(health.router, prefix=settings.api_prefix)
 app.include_router(campaigns.router, prefix=settings.api_prefix)
 app.include_router(events.router, prefix=settings.api_prefix)
 app.include_router(rooms.router, prefix=settings.api_prefix)
+app.include_router(departments.router, prefix=settings.api_prefix)
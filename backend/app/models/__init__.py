@@ -2,8 +2,12 @@ from .domain import (
     Availability,
     BadgeType,
     Campaign,
+    CampaignAvailabilityParticipants,
+    CampaignAvailabilityTally,
     CampaignEventOption,
+    CampaignEventTally,
     CampaignStatus,
+    CampaignVoterSketch,
     Department,
     EventCategory,
     EventOption,
@@ -20,8 +24,12 @@ __all__ = [
     "Availability",
     "BadgeType",
     "Campaign",
+    "CampaignAvailabilityParticipants",
+    "CampaignAvailabilityTally",
     "CampaignEventOption",
+    "CampaignEventTally",
     "CampaignStatus",
+    "CampaignVoterSketch",
     "Department",
     "EventCategory",
     "EventOption",
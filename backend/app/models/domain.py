@@ -3,7 +3,7 @@ from enum import Enum
 from typing import List, Optional, TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, JSON, LargeBinary
 from sqlmodel import Field, Relationship, SQLModel
 
 # TYPE_CHECKING prevents circular imports
@@ -19,6 +19,8 @@ class Department(SQLModel, table=True):
     dept_code: str = Field(primary_key=True, index=True)
     name: Optional[str] = None
     region: Optional[str] = None
+    # Team size for participation rates; falls back to UserProfile count, then settings
+    headcount: Optional[int] = Field(default=None, ge=1)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
@@ -29,6 +31,9 @@ class CampaignStatus(str, Enum):
 
 
 class Campaign(SQLModel, table=True):
+    # Keyset pagination of a department's campaigns by (created_at, id)
+    __table_args__ = (Index("ix_campaign_dept_created", "dept_code", "created_at", "id"),)
+
     id: str = Field(default_factory=gen_id, primary_key=True, index=True)
     name: str
     dept_code: str = Field(foreign_key="department.dept_code", index=True)
@@ -41,6 +46,11 @@ class Campaign(SQLModel, table=True):
     external_sponsors: float = 0
     winning_event_id: Optional[str] = Field(default=None, foreign_key="event_options.id")
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    # Running aggregates of the private contributions, maintained by add_contribution
+    private_total: float = 0
+    contribution_count: int = 0
+    max_contribution: Optional[float] = None
+    first_contribution_id: Optional[str] = None
 
     # Relationships for eager loading (fixes N+1 query problem)
     stretch_goals: List["StretchGoal"] = Relationship(back_populates="campaign")
@@ -108,6 +118,8 @@ class EventOptionBase(SQLModel):
 
 class EventOption(EventOptionBase, table=True):
     __tablename__ = "event_options"
+    # Stable catalog order for keyset pagination, also serves the region filter
+    __table_args__ = (Index("ix_event_options_catalog_order", "location_region", "title", "id"),)
     id: str = Field(default_factory=gen_id, primary_key=True, index=True)
 
 
@@ -118,6 +130,8 @@ class CampaignEventOption(SQLModel, table=True):
 
 
 class StretchGoal(SQLModel, table=True):
+    __table_args__ = (Index("ix_stretchgoal_campaign_unlocked", "campaign_id", "unlocked"),)
+
     id: str = Field(default_factory=gen_id, primary_key=True, index=True)
     campaign_id: str = Field(foreign_key="campaign.id", index=True)
     amount_threshold: float
@@ -136,6 +150,12 @@ class BadgeType(str, Enum):
 
 
 class PrivateContribution(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_privatecontribution_campaign_amount", "campaign_id", "amount"),
+        # Activity buckets (app.services.activity)
+        Index("ix_privatecontribution_campaign_created", "campaign_id", "created_at"),
+    )
+
     id: str = Field(default_factory=gen_id, primary_key=True, index=True)
     campaign_id: str = Field(foreign_key="campaign.id", index=True)
     user_name: str
@@ -160,6 +180,13 @@ class UserProfile(SQLModel, table=True):
 
 
 class Vote(SQLModel, table=True):
+    # Covers per-campaign vote and distinct-voter counts without touching the table
+    __table_args__ = (
+        Index("ix_vote_campaign_voter", "campaign_id", "user_id", "session_id"),
+        # Activity buckets (app.services.activity)
+        Index("ix_vote_campaign_created", "campaign_id", "created_at"),
+    )
+
     id: str = Field(default_factory=gen_id, primary_key=True, index=True)
     campaign_id: str = Field(foreign_key="campaign.id", index=True)
     event_id: str = Field(foreign_key="event_options.id", index=True)
@@ -170,13 +197,62 @@ class Vote(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
+class CampaignEventTally(SQLModel, table=True):
+    """Vote totals per campaign and event, maintained by submit_votes (see app.services.tally)."""
+
+    __tablename__ = "campaign_event_tally"
+
+    campaign_id: str = Field(foreign_key="campaign.id", primary_key=True)
+    event_id: str = Field(foreign_key="event_options.id", primary_key=True)
+    weight_sum: int = 0
+    positive_weight: int = 0
+    super_like_count: int = 0
+    vote_count: int = 0
+    voter_count: int = 0
+    # Ranking tie-break: categories whose events were voted first come first
+    first_voted_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class CampaignVoterSketch(SQLModel, table=True):
+    """HyperLogLog registers of a campaign's voters, for department-wide distinct counts."""
+
+    __tablename__ = "campaign_voter_sketch"
+
+    campaign_id: str = Field(foreign_key="campaign.id", primary_key=True)
+    registers: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+
+
+class CampaignAvailabilityTally(SQLModel, table=True):
+    """Availability rows per campaign, date and slot mask, maintained by submit_availability."""
+
+    __tablename__ = "campaign_availability_tally"
+
+    campaign_id: str = Field(foreign_key="campaign.id", primary_key=True)
+    date: str = Field(primary_key=True)
+    slot_mask: int = Field(primary_key=True)
+    participant_count: int = 0
+
+
+class CampaignAvailabilityParticipants(SQLModel, table=True):
+    """Distinct availability participants per campaign, maintained by submit_availability."""
+
+    __tablename__ = "campaign_availability_participants"
+
+    campaign_id: str = Field(foreign_key="campaign.id", primary_key=True)
+    participant_count: int = 0
+
+
 class Availability(SQLModel, table=True):
+    # Covers distinct-participant counts per campaign without touching the table
+    __table_args__ = (Index("ix_availability_campaign_participant", "campaign_id", "user_id", "session_id"),)
+
     id: str = Field(default_factory=gen_id, primary_key=True, index=True)
     campaign_id: str = Field(foreign_key="campaign.id", index=True)
     user_id: Optional[str] = Field(default=None, foreign_key="userprofile.id", index=True)
     session_id: Optional[str] = Field(default=None, index=True)
     date: str
-    slots: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    # Bitmask over app.services.availability.SLOTS (morning=1, afternoon=2, evening=4)
+    slot_mask: int = Field(default=0, nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
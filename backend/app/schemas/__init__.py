@@ -1,10 +1,26 @@
 from .domain import (
     ApiMessage,
+    AvailabilityDate,
     AvailabilityPayload,
+    AvailabilitySlot,
+    AvailabilitySummary,
+    BestDates,
+    CampaignActivity,
     CampaignCreate,
+    CampaignListNormalized,
+    CampaignNormalized,
     CampaignRead,
+    CampaignSummary,
+    DashboardDeadline,
+    DashboardEvent,
+    DateCandidate,
+    DepartmentAnalytics,
+    DepartmentDashboard,
     EventOptionCreate,
     EventOptionRead,
+    FundingBucket,
+    Leaderboard,
+    LeaderboardEntry,
     PrivateContributionCreate,
     PrivateContributionRead,
     RoomCreate,
@@ -12,16 +28,33 @@ from .domain import (
     StretchGoalCreate,
     StretchGoalRead,
     TeamAnalytics,
+    VoteBucket,
     VotePayload,
 )
 
 __all__ = [
     "ApiMessage",
+    "AvailabilityDate",
     "AvailabilityPayload",
+    "AvailabilitySlot",
+    "AvailabilitySummary",
+    "BestDates",
+    "CampaignActivity",
     "CampaignCreate",
+    "CampaignListNormalized",
+    "CampaignNormalized",
     "CampaignRead",
+    "CampaignSummary",
+    "DashboardDeadline",
+    "DashboardEvent",
+    "DateCandidate",
+    "DepartmentAnalytics",
+    "DepartmentDashboard",
     "EventOptionCreate",
     "EventOptionRead",
+    "FundingBucket",
+    "Leaderboard",
+    "LeaderboardEntry",
     "PrivateContributionCreate",
     "PrivateContributionRead",
     "RoomCreate",
@@ -29,5 +62,6 @@ __all__ = [
     "StretchGoalCreate",
     "StretchGoalRead",
     "TeamAnalytics",
+    "VoteBucket",
     "VotePayload",
 ]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -238,15 +238,88 @@ class CampaignRead(CampaignBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CampaignSummary(CampaignBase):
+    """Campaign without child arrays; funding and participation aggregated in SQL."""
+
+    id: str
+    created_at: datetime
+    total_funded: float
+    funding_percentage: float
+    contribution_count: int
+    vote_count: int
+    voter_count: int
+    unlocked_stretch_goal_count: int
+
+
+class CampaignNormalized(CampaignBase):
+    """CampaignRead with event options referenced by id instead of embedded."""
+
+    id: str
+    created_at: datetime
+    event_option_ids: List[str] = Field(default_factory=list)
+    stretch_goals: List[StretchGoalRead] = Field(default_factory=list)
+    private_contributions: List[PrivateContributionRead] = Field(default_factory=list)
+
+
+class CampaignListNormalized(BaseModel):
+    """Campaign list where every linked event option appears once, keyed by id."""
+
+    campaigns: List[CampaignNormalized]
+    event_options: Dict[str, EventOptionRead]
+
+
 class VotePayload(BaseModel):
     event_id: str
     weight: int = 1
     is_super_like: bool = False
 
 
+# Slot vocabulary of the date grid, in bit order (see app.services.availability)
+AvailabilitySlotName = Literal["morning", "afternoon", "evening"]
+
+
 class AvailabilityPayload(BaseModel):
     date: str
+    slots: List[AvailabilitySlotName]
+
+
+class AvailabilityDate(BaseModel):
+    date: str
+    available: int
+    slots: Dict[str, int]
+
+
+class AvailabilitySlot(BaseModel):
+    date: str
+    slot: str
+    count: int
+
+
+class AvailabilitySummary(BaseModel):
+    """Participants available per date and slot; available counts any slot."""
+
+    campaign_id: str
+    participant_count: int
     slots: List[str]
+    dates: List[AvailabilityDate]
+    best_dates: List[AvailabilitySlot]
+
+
+class DateCandidate(BaseModel):
+    date: str
+    slot: str
+    attendees: int
+    share: float
+
+
+class BestDates(BaseModel):
+    """Date/slot combinations with the most available participants, best first."""
+
+    campaign_id: str
+    participant_count: int
+    min_attendees: Optional[int] = None
+    best: Optional[DateCandidate] = None
+    runner_ups: List[DateCandidate]
 
 
 class TeamAnalytics(BaseModel):
@@ -260,6 +333,86 @@ class TeamAnalytics(BaseModel):
     participation_rate: int
 
 
+class DepartmentAnalytics(BaseModel):
+    """TeamAnalytics over the pooled votes of all campaigns, per department and company-wide."""
+
+    company: TeamAnalytics
+    departments: Dict[str, TeamAnalytics]
+
+
+class DashboardDeadline(BaseModel):
+    campaign_id: str
+    name: str
+    voting_deadline: datetime
+
+
+class DashboardEvent(BaseModel):
+    event_id: str
+    title: str
+    category: EventCategory
+    weight: int
+    voter_count: int
+
+
+class DepartmentDashboard(BaseModel):
+    """Aggregates across all campaigns of a department."""
+
+    dept_code: str
+    campaign_count: int
+    status_counts: Dict[CampaignStatus, int]
+    total_budget_needed: float
+    total_funded: float
+    funding_percentage: float
+    upcoming_deadlines: List[DashboardDeadline]
+    vote_count: int
+    voter_count: int
+    headcount: int
+    participation_rate: int
+    top_events: List[DashboardEvent]
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    event_id: str
+    title: str
+    category: EventCategory
+    score: int
+    super_like_count: int
+    approval_ratio: float
+    vote_count: int
+    voter_count: int
+
+
+class Leaderboard(BaseModel):
+    """Top linked events of a campaign by weighted vote score."""
+
+    campaign_id: str
+    winning_event_id: Optional[str] = None
+    entries: List[LeaderboardEntry]
+
+
+class VoteBucket(BaseModel):
+    start: datetime
+    votes: int
+    cumulative_votes: int
+
+
+class FundingBucket(BaseModel):
+    start: datetime
+    amount: float
+    cumulative_amount: float
+
+
+class CampaignActivity(BaseModel):
+    """Non-empty activity buckets of a campaign; funding covers private contributions on top of base_funding."""
+
+    campaign_id: str
+    granularity: str
+    base_funding: float
+    votes: List[VoteBucket]
+    funding: List[FundingBucket]
+
+
 class RoomCreate(BaseModel):
     dept_code: str
     campaign_id: Optional[str] = None
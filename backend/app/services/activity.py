@@ -0,0 +1,128 @@
+"""
+Time-bucketed activity of a campaign: votes and private contributions per minute
+or hour, with running totals.
+
+Buckets are computed in SQL (GROUP BY the bucket start in epoch seconds) over the
+(campaign_id, created_at) indexes of vote and privatecontribution. Only non-empty
+buckets are returned.
+
+Buckets that ended more than SETTLE_SECONDS ago are closed: they are cached per
+campaign, series and granularity together with the point up to which they are
+complete. A request only queries the rows after that point (the open bucket, plus
+buckets that closed since the previous request) and extends the cached part, so a
+projector refreshing every few seconds reads a handful of index entries.
+
+The settle delay covers writes whose created_at was taken just before a bucket
+boundary but committed after it. Contributions are append-only; votes are not, as
+submit_votes replaces a voter's earlier votes, so it drops the cached vote series
+(invalidate_activity). The cached series is extended under a write token taken
+before anything is read, so a request racing that invalidation cannot write
+buckets computed from the replaced votes back into the cache.
+"""
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, Integer, cast, func, select
+from sqlmodel import Session
+
+from app.core.cache import get_cache
+from app.models import PrivateContribution, Vote
+from app.schemas.domain import FundingBucket, VoteBucket
+from app.services.caching import ACTIVITY, activity_key
+
+GRANULARITIES: Dict[str, int] = {"minute": 60, "hour": 3600}
+SETTLE_SECONDS = 10
+# Closed buckets never change (see invalidate_activity); the TTL only bounds memory
+ACTIVITY_TTL = 3600
+
+_vote_table = Vote.__table__
+_contribution_table = PrivateContribution.__table__
+
+# (bucket start in epoch seconds, value, running total)
+Bucket = Tuple[int, float, float]
+
+
+def _epoch_seconds(session: Session, column):
+    if session.get_bind().dialect.name == "postgresql":
+        return cast(func.floor(func.extract("epoch", column)), BigInteger)
+    return cast(func.strftime("%s", column), Integer)
+
+
+def _to_datetime(epoch: int) -> datetime:
+    # created_at is stored as naive UTC (datetime.utcnow)
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+
+
+def _to_epoch(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def _query_buckets(
+    session: Session, table, value, campaign_id: str, size: int, start: Optional[int], end: Optional[int]
+) -> List[Tuple[int, float]]:
+    epoch = _epoch_seconds(session, table.c.created_at)
+    bucket = (epoch - epoch % size).label("bucket")
+    stmt = select(bucket, value).where(table.c.campaign_id == campaign_id).group_by(bucket).order_by(bucket)
+    if start is not None:
+        stmt = stmt.where(table.c.created_at >= _to_datetime(start))
+    if end is not None:
+        stmt = stmt.where(table.c.created_at < _to_datetime(end))
+    return [(int(start_), value_ or 0) for start_, value_ in session.connection().execute(stmt)]
+
+
+def _accumulate(buckets: List[Tuple[int, float]], total: float) -> List[Bucket]:
+    result = []
+    for start, value in buckets:
+        total += value
+        result.append((start, value, total))
+    return result
+
+
+def _series(
+    session: Session, series: str, table, value, campaign_id: str, granularity: str, now: datetime
+) -> List[Bucket]:
+    size = GRANULARITIES[granularity]
+    # Everything before closed_until is final
+    closed_until = (_to_epoch(now) - SETTLE_SECONDS) // size * size
+    cache = get_cache()
+    key = activity_key(campaign_id, series, granularity)
+
+    # Taken before the reads: skipped if invalidate_activity runs in between
+    token = cache.write_token(ACTIVITY, key)
+    cached_until, closed = cache.get(ACTIVITY, key) or (None, [])
+    if cached_until != closed_until:
+        total = closed[-1][2] if closed else 0
+        newly_closed = _query_buckets(session, table, value, campaign_id, size, cached_until, closed_until)
+        closed = closed + _accumulate(newly_closed, total)
+        if token is not None:
+            cache.set(ACTIVITY, key, (closed_until, closed), ACTIVITY_TTL, token)
+
+    total = closed[-1][2] if closed else 0
+    open_buckets = _query_buckets(session, table, value, campaign_id, size, closed_until, None)
+    return closed + _accumulate(open_buckets, total)
+
+
+def _since(buckets: List[Bucket], since: Optional[datetime], build: Callable) -> List:
+    start = _to_epoch(since) if since is not None else None
+    return [build(_to_datetime(b), value, total) for b, value, total in buckets if start is None or b >= start]
+
+
+def vote_activity(
+    session: Session, campaign_id: str, granularity: str, now: datetime, since: Optional[datetime] = None
+) -> List[VoteBucket]:
+    buckets = _series(session, "votes", _vote_table, func.count(), campaign_id, granularity, now)
+    return _since(
+        buckets, since, lambda start, votes, total: VoteBucket(start=start, votes=votes, cumulative_votes=total)
+    )
+
+
+def funding_activity(
+    session: Session, campaign_id: str, granularity: str, now: datetime, since: Optional[datetime] = None
+) -> List[FundingBucket]:
+    pc = _contribution_table
+    buckets = _series(session, "funding", pc, func.sum(pc.c.amount), campaign_id, granularity, now)
+    return _since(
+        buckets, since, lambda start, amount, total: FundingBucket(start=start, amount=amount, cumulative_amount=total)
+    )
@@ -1,29 +1,106 @@
+"""
+Team analytics for a campaign: vote aggregation and persona scoring.
+
+aggregate_campaign_votes reads the campaign's campaign_event_tally rows (one per
+voted event option, see app.services.tally), so Python only sees a handful of rows
+regardless of the number of votes; category and outdoor flag come from the event
+feature index (app.services.features). tally_votes does the same fold over already
+loaded objects, deriving each event's features once rather than per vote.
+score_team_analytics turns the totals into TeamAnalytics.
+"""
 from collections import Counter
-from typing import Iterable
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlmodel import Session
 
-from app.models import EventOption, Vote
+from app.models import CampaignEventOption, CampaignEventTally, EventOption, Vote
 from app.schemas.domain import TeamAnalytics
+from app.services.features import CATEGORIES, get_feature_index, normalize_tag
+
+_tally_table = CampaignEventTally.__table__
+_link_table = CampaignEventOption.__table__
+
+
+class VoteTotals(NamedTuple):
+    """Positive vote weight per category (in order of first vote), overall and for outdoor events."""
+
+    category_scores: Counter
+    positive_votes: int
+    outdoor_votes: int
 
 
 def _safe_div(num: float, denom: float) -> float:
     return num / denom if denom else 0
 
 
-def build_team_analytics(events: Iterable[EventOption], votes: Iterable[Vote]) -> TeamAnalytics:
-    event_lookup = {e.id: e for e in events}
+def is_outdoor(tags: List[str]) -> bool:
+    return any(normalize_tag(t) == "outdoor" for t in tags or [])
+
+
+def tally_votes(events: Iterable[EventOption], votes: Iterable[Vote]) -> VoteTotals:
+    event_features: Dict[str, Tuple[str, bool]] = {e.id: (e.category.value, is_outdoor(e.tags)) for e in events}
     category_scores: Counter[str] = Counter()
     outdoor_votes = 0
     positive_votes = 0
 
     for vote in votes:
-        event = event_lookup.get(vote.event_id)
-        if not event or vote.weight <= 0:
+        features = event_features.get(vote.event_id)
+        if not features or vote.weight <= 0:
             continue
-        category_scores[event.category.value] += vote.weight
+        category, outdoor = features
+        category_scores[category] += vote.weight
         positive_votes += vote.weight
-        if "outdoor" in [t.lower() for t in event.tags]:
+        if outdoor:
             outdoor_votes += vote.weight
 
+    return VoteTotals(category_scores, positive_votes, outdoor_votes)
+
+
+def aggregate_campaign_votes(session: Session, campaign_id: str) -> VoteTotals:
+    """
+    VoteTotals of a campaign from its tally rows and the event feature index.
+
+    Only positive votes on event options linked to the campaign count, as in
+    tally_votes. Rows are ordered by first vote so ties in the category ranking
+    resolve the same way as when folding votes in insertion order.
+    """
+    t, link = _tally_table, _link_table
+    stmt = (
+        select(t.c.event_id, t.c.positive_weight)
+        .where(
+            t.c.campaign_id == campaign_id,
+            t.c.positive_weight > 0,
+            t.c.event_id.in_(select(link.c.event_option_id).where(link.c.campaign_id == campaign_id)),
+        )
+        .order_by(t.c.first_voted_at, t.c.event_id)
+    )
+
+    index = get_feature_index()
+    outdoor = index.tag_flags("outdoor")
+    category_scores: Counter[str] = Counter()
+    outdoor_votes = 0
+    for event_id, weight in session.connection().execute(stmt):
+        position = index.position.get(event_id)
+        if position is None:
+            continue
+        category_scores[CATEGORIES[index.category[position]]] += weight
+        if outdoor[position]:
+            outdoor_votes += weight
+    return VoteTotals(category_scores, sum(category_scores.values()), outdoor_votes)
+
+
+def build_team_analytics(events: Iterable[EventOption], votes: Iterable[Vote]) -> TeamAnalytics:
+    return score_team_analytics(tally_votes(events, votes))
+
+
+def score_team_analytics(totals: VoteTotals, participation_rate: Optional[int] = None) -> TeamAnalytics:
+    """
+    Persona scoring. participation_rate comes from app.services.participation; without
+    it (no department context) the historic placeholder of 90 / 80 is used.
+    """
+    category_scores, positive_votes, outdoor_votes = totals
+
     total_score = sum(category_scores.values())
     action_level = round(_safe_div(category_scores.get("Action", 0), total_score) * 100) if total_score else 25
     food_focus = round(_safe_div(category_scores.get("Food", 0), total_score) * 100) if total_score else 30
@@ -50,7 +127,8 @@ def build_team_analytics(events: Iterable[EventOption], votes: Iterable[Vote]) -
         persona_description = "Entspannung und gutes Essen sind Favoriten."
 
     top_categories = [name for name, _ in category_scores.most_common(2)] or ["Action", "Food"]
-    participation_rate = 90 if positive_votes else 80
+    if participation_rate is None:
+        participation_rate = 90 if positive_votes else 80
 
     return TeamAnalytics(
         action_level=action_level,
@@ -0,0 +1,346 @@
+"""
+Availability aggregation: who can attend on which date and slot.
+
+Availability rows store their slots as a bitmask over the fixed vocabulary SLOTS
+(morning=1, afternoon=2, evening=4, matching DateGrid.tsx) in slot_mask. The API
+keeps slot names: slots_to_mask / mask_to_slots map at the edge. AvailabilityPayload
+only accepts names from SLOTS, so unknown slots are rejected with 422. submit_availability writes one row per participant and date.
+
+campaign_availability_tally holds how many participants chose each slot mask on
+each date (at most 7 rows per date), maintained by apply_availability_replacement
+in the same transaction as the rows; campaign_availability_participants holds the
+number of distinct participants (keyed like voters), adjusted by replace_availability
+from the participants it touched. Reads never touch the availability rows:
+load_slot_counts turns the tally into a (slots, dates) count matrix with one
+bincount per slot bit. That matrix is cached per campaign and dropped by
+invalidate_availability; the summary and the best-dates finder are both derived
+from it.
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, get_args
+
+import numpy as np
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session
+
+from app.models import Availability, CampaignAvailabilityParticipants, CampaignAvailabilityTally
+from app.schemas.domain import (
+    AvailabilityDate,
+    AvailabilitySlot,
+    AvailabilitySlotName,
+    AvailabilitySummary,
+    DateCandidate,
+)
+
+SLOTS = get_args(AvailabilitySlotName)
+SLOT_BITS: Dict[str, int] = {slot: 1 << i for i, slot in enumerate(SLOTS)}
+BEST_DATES = 3
+
+_availability_table = Availability.__table__
+_tally_table = CampaignAvailabilityTally.__table__
+_participants_table = CampaignAvailabilityParticipants.__table__
+
+
+def slots_to_mask(slots: Iterable[str]) -> int:
+    """Raises ValueError for slot names outside SLOTS."""
+    mask = 0
+    for slot in slots or ():
+        if slot not in SLOT_BITS:
+            raise ValueError(f"Unknown slot: {slot}")
+        mask |= SLOT_BITS[slot]
+    return mask
+
+
+def mask_to_slots(mask: int) -> List[str]:
+    return [slot for slot, bit in SLOT_BITS.items() if mask & bit]
+
+
+# Maintenance ----------------------------------------------------------------
+
+
+def _upsert(session: Session, table, rows: List[dict], index_elements: List, counter: str) -> None:
+    insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={counter: table.c[counter] + stmt.excluded[counter]},
+    )
+    session.connection().execute(stmt)
+
+
+def apply_availability_replacement(
+    session: Session,
+    campaign_id: str,
+    previous: Iterable[Tuple[str, int]],
+    new: Iterable[Tuple[str, int]],
+) -> None:
+    """Apply the tally delta of replacing previous (date, slot_mask) rows with new ones. Does not commit."""
+    deltas: Counter = Counter()
+    deltas.subtract(previous)
+    deltas.update(new)
+    rows = [
+        {"campaign_id": campaign_id, "date": date, "slot_mask": slot_mask, "participant_count": delta}
+        for (date, slot_mask), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    t = _tally_table
+    _upsert(session, t, rows, [t.c.campaign_id, t.c.date, t.c.slot_mask], "participant_count")
+    session.connection().execute(delete(t).where(t.c.campaign_id == campaign_id, t.c.participant_count <= 0))
+
+
+def _participant_key(user_id: Optional[str], session_id: Optional[str]) -> Optional[Tuple[str, str]]:
+    if user_id is not None:
+        return ("u", user_id)
+    if session_id is not None:
+        return ("s", session_id)
+    return None
+
+
+def _present_participants(
+    session: Session, campaign_id: str, keys: Set[Tuple[str, str]], exclude_ids: Iterable[str] = ()
+) -> Set[Tuple[str, str]]:
+    """The given participant keys that have availability rows in the campaign, apart from exclude_ids."""
+    a = _availability_table
+    conn = session.connection()
+    users = [value for kind, value in keys if kind == "u"]
+    sessions = [value for kind, value in keys if kind == "s"]
+    scope = [a.c.campaign_id == campaign_id, a.c.id.not_in(list(exclude_ids))]
+    present: Set[Tuple[str, str]] = set()
+    if users:
+        rows = conn.execute(select(a.c.user_id).where(*scope, a.c.user_id.in_(users)).distinct())
+        present.update(("u", user) for (user,) in rows)
+    if sessions:
+        rows = conn.execute(
+            select(a.c.session_id).where(*scope, a.c.user_id.is_(None), a.c.session_id.in_(sessions)).distinct()
+        )
+        present.update(("s", sid) for (sid,) in rows)
+    return present
+
+
+def replace_availability(
+    session: Session,
+    campaign_id: str,
+    user_id: Optional[str],
+    session_id: Optional[str],
+    masks: Mapping[str, int],
+) -> None:
+    """
+    Replace the availability of one user or session with one row per date. Does not commit.
+
+    Rows of the same user (or, without one, the same session) are replaced. The
+    old rows are removed with DELETE ... RETURNING, which takes the write lock
+    before anything is read, so concurrent resubmits by one participant each
+    subtract only the rows they removed. The tally and the participant count are
+    adjusted in the same transaction; the count only looks at the participants
+    whose rows were replaced or written.
+    """
+    a = _availability_table
+    conn = session.connection()
+    previous_rows = []
+    if user_id:
+        replaced = and_(a.c.campaign_id == campaign_id, a.c.user_id == user_id)
+    elif session_id:
+        replaced = and_(a.c.campaign_id == campaign_id, a.c.session_id == session_id)
+    else:
+        replaced = None
+    if replaced is not None:
+        previous_rows = conn.execute(
+            delete(a).where(replaced).returning(a.c.date, a.c.slot_mask, a.c.user_id, a.c.session_id)
+        ).all()
+
+    apply_availability_replacement(
+        session, campaign_id, [(date, slot_mask) for date, slot_mask, _, _ in previous_rows], masks.items()
+    )
+    new_rows = [
+        Availability(campaign_id=campaign_id, date=date, slot_mask=slot_mask, user_id=user_id, session_id=session_id)
+        for date, slot_mask in masks.items()
+    ]
+    session.add_all(new_rows)
+    session.flush()
+
+    new_key = _participant_key(user_id, session_id)
+    removed = {_participant_key(user, sid) for _, _, user, sid in previous_rows} - {None}
+    touched = removed | ({new_key} if new_key is not None else set())
+    # Read under the write lock taken above; rows other than the ones just written
+    remaining = _present_participants(session, campaign_id, touched, [row.id for row in new_rows])
+    before = remaining | removed
+    after = remaining | ({new_key} if new_key is not None and new_rows else set())
+    delta = len(after) - len(before)
+    if new_key is None:
+        # Rows without user and session each count as their own participant
+        delta += len(new_rows)
+    if delta:
+        p = _participants_table
+        _upsert(
+            session, p, [{"campaign_id": campaign_id, "participant_count": delta}], [p.c.campaign_id], "participant_count"
+        )
+
+
+def delete_availability_tally(session: Session, campaign_id: str) -> None:
+    conn = session.connection()
+    conn.execute(delete(_tally_table).where(_tally_table.c.campaign_id == campaign_id))
+    conn.execute(delete(_participants_table).where(_participants_table.c.campaign_id == campaign_id))
+
+
+def _participant_counts():
+    """Distinct participants per campaign, counted from the availability rows."""
+    a = _availability_table
+    anonymous = a.c.user_id.is_(None)
+    return select(
+        a.c.campaign_id,
+        func.count(func.distinct(a.c.user_id))
+        + func.count(func.distinct(case((anonymous, a.c.session_id))))
+        # Rows without user and session each count as their own participant
+        + func.count(case((and_(anonymous, a.c.session_id.is_(None)), 1))),
+    ).group_by(a.c.campaign_id)
+
+
+def _computed_tally():
+    a = _availability_table
+    return select(a.c.campaign_id, a.c.date, a.c.slot_mask, func.count()).group_by(
+        a.c.campaign_id, a.c.date, a.c.slot_mask
+    )
+
+
+def rebuild_availability_tally(session: Session, campaign_id: Optional[str] = None) -> int:
+    """Recompute tally rows and participant counts from the availability table. Does not commit."""
+    a, t, p = _availability_table, _tally_table, _participants_table
+    computed = _computed_tally()
+    participants = _participant_counts()
+    cleared = [delete(t), delete(p)]
+    if campaign_id is not None:
+        computed = computed.where(a.c.campaign_id == campaign_id)
+        participants = participants.where(a.c.campaign_id == campaign_id)
+        cleared = [delete(t).where(t.c.campaign_id == campaign_id), delete(p).where(p.c.campaign_id == campaign_id)]
+    conn = session.connection()
+    for stmt in cleared:
+        conn.execute(stmt)
+    conn.execute(p.insert().from_select(["campaign_id", "participant_count"], participants))
+    result = conn.execute(
+        t.insert().from_select(["campaign_id", "date", "slot_mask", "participant_count"], computed)
+    )
+    return result.rowcount
+
+
+def verify_availability_tally(session: Session, campaign_id: str) -> List[Dict[str, Any]]:
+    """Differences between maintained and recomputed tally rows and participant count; empty if consistent."""
+    a, t, p = _availability_table, _tally_table, _participants_table
+    conn = session.connection()
+    computed = {
+        (date, slot_mask): count
+        for _, date, slot_mask, count in conn.execute(_computed_tally().where(a.c.campaign_id == campaign_id))
+    }
+    stored = {
+        (date, slot_mask): count
+        for date, slot_mask, count in conn.execute(
+            select(t.c.date, t.c.slot_mask, t.c.participant_count).where(t.c.campaign_id == campaign_id)
+        )
+    }
+    mismatches: List[Dict[str, Any]] = [
+        {
+            "column": "participant_count",
+            "date": key[0],
+            "slot_mask": key[1],
+            "expected": computed.get(key, 0),
+            "actual": stored.get(key, 0),
+        }
+        for key in sorted(computed.keys() | stored.keys())
+        if computed.get(key, 0) != stored.get(key, 0) or key not in computed
+    ]
+    expected = conn.execute(_participant_counts().where(a.c.campaign_id == campaign_id)).first()
+    expected_count = expected[1] if expected is not None else 0
+    actual_count = _stored_participant_count(session, campaign_id)
+    if expected_count != actual_count:
+        mismatches.append(
+            {"column": "participants", "date": None, "slot_mask": None, "expected": expected_count, "actual": actual_count}
+        )
+    return mismatches
+
+
+# Reads ----------------------------------------------------------------------
+
+
+class SlotCounts(NamedTuple):
+    """Participants available per slot and date of one campaign."""
+
+    dates: List[str]
+    counts: np.ndarray  # (slots, dates)
+    available: np.ndarray  # (dates,), participants available in any slot
+    participant_count: int
+
+
+def _stored_participant_count(session: Session, campaign_id: str) -> int:
+    p = _participants_table
+    count = session.connection().execute(
+        select(p.c.participant_count).where(p.c.campaign_id == campaign_id)
+    ).scalar_one_or_none()
+    return count or 0
+
+
+def load_slot_counts(session: Session, campaign_id: str) -> SlotCounts:
+    t = _tally_table
+    rows = session.connection().execute(
+        select(t.c.date, t.c.slot_mask, t.c.participant_count).where(t.c.campaign_id == campaign_id)
+    ).all()
+    dates = sorted({date for date, _, _ in rows})
+    position = {date: i for i, date in enumerate(dates)}
+    date_index = np.fromiter((position[date] for date, _, _ in rows), dtype=np.intp, count=len(rows))
+    masks = np.fromiter((mask for _, mask, _ in rows), dtype=np.int64, count=len(rows))
+    participants = np.fromiter((count for _, _, count in rows), dtype=np.int64, count=len(rows))
+
+    def per_date(selected: np.ndarray) -> np.ndarray:
+        return np.bincount(date_index, weights=participants * selected, minlength=len(dates)).astype(np.int64)
+
+    counts = np.array([per_date((masks & bit) > 0) for bit in SLOT_BITS.values()], dtype=np.int64)
+    return SlotCounts(dates, counts, per_date(masks > 0), _stored_participant_count(session, campaign_id))
+
+
+def rank_slots(slot_counts: SlotCounts, limit: int, min_attendees: int = 1) -> List[Tuple[int, int, int]]:
+    """
+    (date index, slot index, attendees) of the best date/slot combinations.
+
+    Vectorized over the whole (dates x slots) grid: combinations below min_attendees
+    are dropped, the rest ordered by attendees (descending), then date and slot.
+    """
+    grid = slot_counts.counts.T.ravel()  # date-major, so the flat index orders by date, then slot
+    eligible = np.flatnonzero(grid >= max(min_attendees, 1))
+    order = eligible[np.lexsort((eligible, -grid[eligible]))][:limit]
+    return [(int(i) // len(SLOTS), int(i) % len(SLOTS), int(grid[i])) for i in order]
+
+
+def build_availability_summary(campaign_id: str, slot_counts: SlotCounts) -> AvailabilitySummary:
+    dates, counts = slot_counts.dates, slot_counts.counts
+    return AvailabilitySummary(
+        campaign_id=campaign_id,
+        participant_count=slot_counts.participant_count,
+        slots=list(SLOTS),
+        dates=[
+            AvailabilityDate(
+                date=date,
+                available=int(slot_counts.available[i]),
+                slots={slot: int(counts[s, i]) for s, slot in enumerate(SLOTS)},
+            )
+            for i, date in enumerate(dates)
+        ],
+        best_dates=[
+            AvailabilitySlot(date=dates[d], slot=SLOTS[s], count=count)
+            for d, s, count in rank_slots(slot_counts, BEST_DATES)
+        ],
+    )
+
+
+def date_candidates(slot_counts: SlotCounts, limit: int, min_attendees: int = 1) -> List[DateCandidate]:
+    total = slot_counts.participant_count
+    return [
+        DateCandidate(
+            date=slot_counts.dates[d],
+            slot=SLOTS[s],
+            attendees=count,
+            share=round(count / total, 4) if total else 0.0,
+        )
+        for d, s, count in rank_slots(slot_counts, limit, min_attendees)
+    ]
@@ -1,99 +1,120 @@
+"""
+Private contributions: running funding aggregates, badges and stretch goals.
+
+Campaign keeps running aggregates of its private contributions (private_total,
+contribution_count, max_contribution, first_contribution_id). add_contribution
+bumps them with one UPDATE ... RETURNING, which also serializes concurrent
+contributions to the same campaign, and decides badges and stretch-goal unlocks
+from the returned values. Each contribution costs a constant number of
+statements; the badge updates touch only the earliest contribution and the ones
+at the maximum amount (ix_privatecontribution_campaign_amount).
+
+Badge rules:
+- early_bird: the earliest contribution
+- whale: every contribution at the maximum amount, if that is >= 100 (overrides
+  early_bird); whales below a new maximum lose the badge
+- closer: the contribution that pushes total funding to the budget (overrides both)
+
+Stretch goals unlock when the funding percentage reaches amount_threshold.
+rebuild_funding_aggregates recomputes the aggregates from the contribution table.
+"""
 import logging
-from typing import Iterable, Tuple
+from typing import Optional
 
-from sqlmodel import Session, select
+from sqlalchemy import and_, case, func, select, update
+from sqlmodel import Session
 
 from app.models import BadgeType, Campaign, PrivateContribution, StretchGoal
 
 logger = logging.getLogger(__name__)
 
+WHALE_MINIMUM = 100
 
-def get_total_funded(campaign: Campaign, contributions: Iterable[PrivateContribution]) -> float:
-    private_total = sum(c.amount for c in contributions)
-    return campaign.company_budget_available + campaign.external_sponsors + private_total
+_campaign_table = Campaign.__table__
+_contribution_table = PrivateContribution.__table__
+_goal_table = StretchGoal.__table__
 
 
-def add_contribution(session: Session, campaign: Campaign, contribution: PrivateContribution) -> Tuple[Campaign, list[PrivateContribution], list[StretchGoal]]:
+def add_contribution(session: Session, campaign: Campaign, contribution: PrivateContribution) -> Campaign:
     """
-    Add a contribution with atomic transaction.
+    Add a contribution, its badges and stretch-goal unlocks in one transaction.
 
-    OLD: 2 separate commits → data inconsistency risk
-    NEW: Single transaction with rollback on error
-
-    All operations (contribution, badges, stretch goals) are committed together
-    or rolled back if any step fails.
+    All statements are committed together or rolled back if any step fails.
     """
+    c, pc, g = _campaign_table, _contribution_table, _goal_table
+    amount = contribution.amount
     try:
-        # Add contribution and flush to get ID (but don't commit yet)
-        session.add(contribution)
-        session.flush()  # Gets ID without committing
-
-        # Load all contributions for this campaign (including the new one)
-        contributions = list(
-            session.exec(
-                select(PrivateContribution)
-                .where(PrivateContribution.campaign_id == campaign.id)
-                .order_by(PrivateContribution.created_at)
-            ).all()
-        )
-
-        # Calculate totals
-        total_before = get_total_funded(campaign, contributions[:-1])
-        total_after = get_total_funded(campaign, contributions)
+        conn = session.connection()
+        private_total, max_amount, first_id = conn.execute(
+            update(c)
+            .where(c.c.id == campaign.id)
+            .values(
+                private_total=c.c.private_total + amount,
+                contribution_count=c.c.contribution_count + 1,
+                max_contribution=case(
+                    (and_(c.c.max_contribution.is_not(None), c.c.max_contribution >= amount), c.c.max_contribution),
+                    else_=amount,
+                ),
+                first_contribution_id=func.coalesce(c.c.first_contribution_id, contribution.id),
+            )
+            .returning(c.c.private_total, c.c.max_contribution, c.c.first_contribution_id)
+        ).one()
+
+        base = campaign.company_budget_available + campaign.external_sponsors
+        total_after = base + private_total
+        total_before = total_after - amount
         percent_after = (total_after / campaign.total_budget_needed) * 100 if campaign.total_budget_needed else 0
-
-        # Assign badges (all in same transaction)
-        if contributions:
-            # Early bird badge (first contributor)
-            earliest = contributions[0]
-            earliest.badge = BadgeType.early_bird
-
-            # Whale badge (highest contribution >= 100€)
-            max_amount = max(c.amount for c in contributions)
-            for c in contributions:
-                # Reset whale badge first (in case someone else contributed more)
-                if c.badge == BadgeType.whale and c.amount < max_amount:
-                    c.badge = None
-
-                # Assign whale badge to highest contributor(s)
-                if c.amount == max_amount and c.amount >= 100:
-                    c.badge = BadgeType.whale
-
-        # Closer badge (pushed campaign over the funding goal)
+        has_whale = max_amount >= WHALE_MINIMUM
+
+        # Same precedence as for the existing contributions below: early_bird < whale < closer
+        if first_id == contribution.id:
+            contribution.badge = BadgeType.early_bird
+        if contribution.badge == BadgeType.whale and amount < max_amount:
+            contribution.badge = None
+        if has_whale and amount == max_amount:
+            contribution.badge = BadgeType.whale
         if total_before < campaign.total_budget_needed <= total_after:
             contribution.badge = BadgeType.closer
+        session.add(contribution)
+        session.flush()
 
-        # Update stretch goals
-        goals = list(
-            session.exec(
-                select(StretchGoal)
-                .where(StretchGoal.campaign_id == campaign.id)
-            ).all()
+        if first_id != contribution.id:
+            conn.execute(update(pc).where(pc.c.id == first_id).values(badge=BadgeType.early_bird))
+        others = and_(pc.c.campaign_id == campaign.id, pc.c.id != contribution.id)
+        conn.execute(
+            update(pc).where(others, pc.c.badge == BadgeType.whale, pc.c.amount < max_amount).values(badge=None)
         )
+        if has_whale:
+            conn.execute(update(pc).where(others, pc.c.amount == max_amount).values(badge=BadgeType.whale))
 
-        for goal in goals:
-            # amount_threshold is interpreted as percentage (e.g. 100 = 100%)
-            goal.unlocked = percent_after >= goal.amount_threshold
+        # amount_threshold is interpreted as percentage (e.g. 100 = 100%)
+        conn.execute(update(g).where(g.c.campaign_id == campaign.id).values(unlocked=g.c.amount_threshold <= percent_after))
 
-        # Single commit for all changes (atomic transaction)
         session.commit()
 
-        # Refresh all objects to get latest state
-        session.refresh(contribution)
-        for c in contributions:
-            session.refresh(c)
-        for g in goals:
-            session.refresh(g)
-
         logger.info(
-            f"Contribution added: {contribution.amount}€ by {contribution.user_name} "
+            f"Contribution added: {amount}€ by {contribution.user_name} "
             f"(Campaign: {campaign.id}, Total: {total_after}€)"
         )
-
-        return campaign, contributions, goals
+        return campaign
 
     except Exception as e:
         # Rollback on any error to maintain data consistency
         session.rollback()
         logger.error(f"Failed to add contribution: {e}", exc_info=True)
         raise  # Re-raise to let caller handle HTTP error
+
+
+def rebuild_funding_aggregates(session: Session, campaign_id: Optional[str] = None) -> int:
+    """Recompute the running aggregates from the contribution table. Does not commit."""
+    c, pc = _campaign_table, _contribution_table
+    own = pc.c.campaign_id == c.c.id
+    stmt = update(c).values(
+        private_total=select(func.coalesce(func.sum(pc.c.amount), 0.0)).where(own).scalar_subquery(),
+        contribution_count=select(func.count()).where(own).scalar_subquery(),
+        max_contribution=select(func.max(pc.c.amount)).where(own).scalar_subquery(),
+        first_contribution_id=select(pc.c.id).where(own).order_by(pc.c.created_at, pc.c.id).limit(1).scalar_subquery(),
+    )
+    if campaign_id is not None:
+        stmt = stmt.where(c.c.id == campaign_id)
+    return session.connection().execute(stmt).rowcount
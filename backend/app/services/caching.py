@@ -0,0 +1,122 @@
+"""
+Cache namespaces and invalidation hooks for catalog, campaign and analytics reads.
+
+Routes read through get_cache() with the namespaces below and call the
+invalidate_* helpers after committing writes. Catalog changes are detected
+automatically from the ORM so event options created anywhere (e.g. inline in
+create_campaign) invalidate cached catalog pages and analytics.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import select
+
+from app.core.cache import get_cache
+from app.core.database import session_scope
+from app.core.existence import ExistenceIndex
+from app.models import Campaign, EventOption, Room
+
+CATALOG = "catalog"
+CAMPAIGN = "campaign"
+ANALYTICS = "analytics"
+# Key of the department/company rollup in the ANALYTICS namespace
+DEPARTMENT_ROLLUP = "departments"
+DEPARTMENT = "department"
+ACTIVITY = "activity"
+
+
+def leaderboard_key(campaign_id: str) -> str:
+    """Key of a campaign's leaderboard in the ANALYTICS namespace."""
+    return f"{campaign_id}:leaderboard"
+
+
+def availability_key(campaign_id: str) -> str:
+    """Key of a campaign's availability summary in the ANALYTICS namespace."""
+    return f"{campaign_id}:availability"
+
+
+def activity_key(campaign_id: str, series: str, granularity: str) -> str:
+    """Key of a campaign's closed activity buckets in the ACTIVITY namespace."""
+    return f"{campaign_id}:{series}:{granularity}"
+
+
+def _load_campaign_ids(since: Optional[datetime] = None) -> List[str]:
+    stmt = select(Campaign.id)
+    if since is not None:
+        stmt = stmt.where(Campaign.created_at >= since)
+    with session_scope() as session:
+        return list(session.exec(stmt).all())
+
+
+def _load_room_tokens(since: Optional[datetime] = None) -> List[str]:
+    stmt = select(Room.token)
+    if since is not None:
+        stmt = stmt.where(Room.created_at >= since)
+    with session_scope() as session:
+        return list(session.exec(stmt).all())
+
+
+campaign_ids = ExistenceIndex("campaign", _load_campaign_ids)
+room_tokens = ExistenceIndex("room", _load_room_tokens)
+
+
+def invalidate_campaign(campaign_id: str) -> None:
+    """Drop the cached campaign document and its analytics."""
+    cache = get_cache()
+    cache.delete(CAMPAIGN, campaign_id)
+    invalidate_analytics(campaign_id)
+    invalidate_availability(campaign_id)
+
+
+def invalidate_analytics(campaign_id: str) -> None:
+    cache = get_cache()
+    cache.delete(ANALYTICS, campaign_id)
+    cache.delete(ANALYTICS, leaderboard_key(campaign_id))
+    cache.delete(ANALYTICS, DEPARTMENT_ROLLUP)
+
+
+def invalidate_availability(campaign_id: str) -> None:
+    get_cache().delete(ANALYTICS, availability_key(campaign_id))
+
+
+def invalidate_activity(campaign_id: str, series: str = "votes") -> None:
+    """Drop cached closed activity buckets; votes need this whenever earlier votes are replaced."""
+    from app.services.activity import GRANULARITIES  # local import to avoid circular deps
+
+    cache = get_cache()
+    for granularity in GRANULARITIES:
+        cache.delete(ACTIVITY, activity_key(campaign_id, series, granularity))
+
+
+def invalidate_department(dept_code: str) -> None:
+    """Drop the cached department dashboard; call after any change to its campaigns."""
+    get_cache().delete(DEPARTMENT, dept_code)
+
+
+def invalidate_catalog() -> None:
+    cache = get_cache()
+    cache.invalidate(CATALOG)
+    # Analytics and dashboards read event categories, tags and titles as well
+    cache.invalidate(ANALYTICS)
+    cache.invalidate(DEPARTMENT)
+
+
+@event.listens_for(OrmSession, "before_flush")
+def _track_catalog_changes(session: OrmSession, flush_context, instances) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, EventOption):
+            session.info["catalog_changed"] = True
+            return
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_catalog_on_commit(session: OrmSession) -> None:
+    if session.info.pop("catalog_changed", False):
+        invalidate_catalog()
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _reset_catalog_flag(session: OrmSession) -> None:
+    session.info.pop("catalog_changed", None)
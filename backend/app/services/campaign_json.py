@@ -0,0 +1,90 @@
+"""
+Optional SQLite engine that assembles campaign JSON inside the database.
+
+Instead of three round trips plus Python hydration, one statement builds every
+campaign document with json_object and correlated json_group_array subqueries for
+event options, stretch goals and contributions. SQLite returns the complete
+response array as text, which is sent without constructing any Python objects.
+
+Enable with CAMPAIGN_READ_ENGINE=sqlite_json (SQLite databases only). Output
+matches CampaignRead: booleans and JSON columns are converted explicitly,
+timestamps are rendered in the same ISO format pydantic uses.
+"""
+from typing import Any, List, Sequence
+
+from sqlalchemy import Boolean, DateTime, JSON, case, func, literal_column, select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import Session
+
+from app.models import Campaign, CampaignEventOption, EventOption, PrivateContribution, StretchGoal
+from app.services.campaign_reads import (
+    CAMPAIGN_FIELDS,
+    CONTRIBUTION_FIELDS,
+    EVENT_OPTION_FIELDS,
+    STRETCH_GOAL_FIELDS,
+)
+
+_campaign_table = Campaign.__table__
+_event_table = EventOption.__table__
+_link_table = CampaignEventOption.__table__
+_goal_table = StretchGoal.__table__
+_contribution_table = PrivateContribution.__table__
+
+
+def _json_value(column: Any) -> ColumnElement:
+    if isinstance(column.type, Boolean):
+        return func.json(case((column.is_(None), "null"), (column, "true"), else_="false"))
+    if isinstance(column.type, JSON):
+        return func.json(column)
+    if isinstance(column.type, DateTime):
+        # SQLite stores "YYYY-MM-DD HH:MM:SS.ffffff"; pydantic drops a zero fraction
+        return case(
+            (func.substr(column, 21) == "000000", func.replace(func.substr(column, 1, 19), " ", "T")),
+            else_=func.replace(column, " ", "T"),
+        )
+    return column
+
+
+def _json_object(table: Any, fields: Sequence[str], *extra: ColumnElement) -> ColumnElement:
+    args: List[ColumnElement] = []
+    for field in fields:
+        args += [literal_column(f"'{field}'"), _json_value(table.c[field])]
+    return func.json_object(*args, *extra)
+
+
+def _child_array(table: Any, fields: Sequence[str], campaign_column: Any, from_clause: Any = None) -> ColumnElement:
+    stmt = select(func.json_group_array(_json_object(table, fields)))
+    if from_clause is not None:
+        stmt = stmt.select_from(from_clause)
+    # json() keeps the subquery result an array instead of an escaped string
+    return func.json(stmt.where(campaign_column == _campaign_table.c.id).scalar_subquery())
+
+
+def _campaign_document() -> ColumnElement:
+    return _json_object(
+        _campaign_table,
+        CAMPAIGN_FIELDS,
+        literal_column("'event_options'"),
+        _child_array(
+            _event_table,
+            EVENT_OPTION_FIELDS,
+            _link_table.c.campaign_id,
+            _link_table.join(_event_table, _event_table.c.id == _link_table.c.event_option_id),
+        ),
+        literal_column("'stretch_goals'"),
+        _child_array(_goal_table, STRETCH_GOAL_FIELDS, _goal_table.c.campaign_id),
+        literal_column("'private_contributions'"),
+        _child_array(_contribution_table, CONTRIBUTION_FIELDS, _contribution_table.c.campaign_id),
+    )
+
+
+def load_department_campaigns_json(session: Session, dept_code: str) -> str:
+    """JSON array text of all campaigns of a department, CampaignRead-shaped, by (created_at, id)."""
+    documents = (
+        select(_campaign_document().label("doc"))
+        .where(_campaign_table.c.dept_code == dept_code)
+        .order_by(_campaign_table.c.created_at, _campaign_table.c.id)
+        .subquery()
+    )
+    stmt = select(func.json_group_array(func.json(documents.c.doc)))
+    return session.connection().execute(stmt).scalar_one()
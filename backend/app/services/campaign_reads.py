@@ -0,0 +1,281 @@
+"""
+Lean read model for campaign responses.
+
+hydrate_campaign / hydrate_campaigns_optimized build ORM objects, convert them via
+CampaignRead.from_orm, copy them with the child lists and let FastAPI validate the
+result again through response_model: three object layers per campaign.
+
+This module selects only the response columns with SQLAlchemy Core (no identity
+map, no ORM instances) and builds plain response dicts in a single pass. Routes
+return them directly as ORJSONResponse, which skips response_model validation.
+The dicts have exactly the shape of CampaignRead; field lists are derived from
+the schemas so both paths cannot drift apart.
+
+A FieldSet (parsed from the fields= / include= query parameters) restricts which
+columns are selected and which relations are queried at all, so list payloads and
+database work shrink to what the caller renders.
+
+load_campaign_documents_normalized returns the same documents with event options
+referenced by id and listed once in a top-level map, so a department list grows
+with the number of distinct events rather than with the number of links.
+
+load_campaign_summaries serves the dashboard list: no child arrays, funding and
+participation aggregated in SQL.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func, literal, select
+from sqlmodel import Session
+
+from app.models import Campaign, CampaignEventOption, EventOption, PrivateContribution, StretchGoal, Vote
+from app.schemas.domain import (
+    CampaignRead,
+    CampaignSummary,
+    EventOptionRead,
+    PrivateContributionRead,
+    StretchGoalRead,
+)
+
+CampaignDocument = Dict[str, Any]
+
+_CHILD_FIELDS = ("event_options", "stretch_goals", "private_contributions")
+CAMPAIGN_FIELDS = tuple(f for f in CampaignRead.model_fields if f not in _CHILD_FIELDS)
+EVENT_OPTION_FIELDS = tuple(EventOptionRead.model_fields)
+STRETCH_GOAL_FIELDS = tuple(StretchGoalRead.model_fields)
+CONTRIBUTION_FIELDS = tuple(PrivateContributionRead.model_fields)
+SUMMARY_FIELDS = tuple(CampaignSummary.model_fields)
+
+RELATION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "event_options": EVENT_OPTION_FIELDS,
+    "stretch_goals": STRETCH_GOAL_FIELDS,
+    "private_contributions": CONTRIBUTION_FIELDS,
+}
+
+_campaign_table = Campaign.__table__
+_event_table = EventOption.__table__
+_link_table = CampaignEventOption.__table__
+_goal_table = StretchGoal.__table__
+_contribution_table = PrivateContribution.__table__
+_vote_table = Vote.__table__
+
+
+class FieldSet(NamedTuple):
+    """Selected campaign columns and, per included relation, its selected columns."""
+
+    campaign: Tuple[str, ...]
+    relations: Dict[str, Tuple[str, ...]]
+
+    @property
+    def is_full(self) -> bool:
+        return self == FULL_FIELDSET
+
+
+FULL_FIELDSET = FieldSet(CAMPAIGN_FIELDS, dict(RELATION_FIELDS))
+
+
+def parse_fieldset(fields: Optional[str], include: Optional[str]) -> FieldSet:
+    """
+    Parse comma-separated fields= / include= parameters.
+
+    include: relations to load (event_options, stretch_goals, private_contributions);
+             omitted = all (with fields=: only the relations it names), empty or
+             "none" = no relations.
+    fields:  campaign columns and "<relation>.<column>" for included relations;
+             omitted = all columns. "id" is always returned. Without include=,
+             a relation is only loaded if fields= names one of its columns.
+    Raises ValueError for unknown names.
+    """
+    if include is None:
+        relations = list(RELATION_FIELDS)
+    else:
+        relations = [r.strip() for r in include.split(",") if r.strip() and r.strip() != "none"]
+        unknown = [r for r in relations if r not in RELATION_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown include: {', '.join(unknown)}")
+
+    if fields is None:
+        return FieldSet(CAMPAIGN_FIELDS, {r: RELATION_FIELDS[r] for r in relations})
+
+    campaign_fields = ["id"]
+    nested: Dict[str, List[str]] = {}
+    for name in (f.strip() for f in fields.split(",")):
+        if not name:
+            continue
+        relation, _, column = name.rpartition(".")
+        if relation:
+            included = relation in RELATION_FIELDS if include is None else relation in relations
+            if not included or column not in RELATION_FIELDS[relation]:
+                raise ValueError(f"Unknown or not included field: {name}")
+            nested.setdefault(relation, ["id"])
+            if column not in nested[relation]:
+                nested[relation].append(column)
+        elif column not in CAMPAIGN_FIELDS:
+            raise ValueError(f"Unknown field: {name}")
+        elif column not in campaign_fields:
+            campaign_fields.append(column)
+
+    if include is None:
+        relations = [r for r in RELATION_FIELDS if r in nested]
+    return FieldSet(
+        tuple(campaign_fields),
+        {r: tuple(nested[r]) if r in nested else RELATION_FIELDS[r] for r in relations},
+    )
+
+
+def project_document(doc: CampaignDocument, fieldset: FieldSet) -> CampaignDocument:
+    """Apply a FieldSet to an already loaded full document (e.g. from cache)."""
+    projected = {f: doc[f] for f in fieldset.campaign}
+    for relation, relation_fields in fieldset.relations.items():
+        projected[relation] = [{f: child[f] for f in relation_fields} for child in doc[relation]]
+    return projected
+
+
+def load_campaign_documents(
+    session: Session,
+    campaign_ids: Sequence[str],
+    fieldset: FieldSet = FULL_FIELDSET,
+) -> List[CampaignDocument]:
+    """
+    Build CampaignRead-shaped dicts for the given ids, preserving their order.
+
+    One Core query for the campaigns plus one per included relation, regardless of
+    the number of campaigns; unknown ids are skipped.
+    """
+    if not campaign_ids:
+        return []
+    conn = session.connection()
+
+    docs: Dict[str, CampaignDocument] = {}
+    campaign_fields = fieldset.campaign
+    rows = conn.execute(
+        select(*(_campaign_table.c[f] for f in campaign_fields)).where(_campaign_table.c.id.in_(campaign_ids))
+    )
+    for row in rows:
+        doc = dict(zip(campaign_fields, row))
+        for relation in fieldset.relations:
+            doc[relation] = []
+        docs[doc["id"]] = doc
+    if not docs:
+        return []
+    ids = list(docs)
+
+    if "event_options" in fieldset.relations:
+        event_fields = fieldset.relations["event_options"]
+        rows = conn.execute(
+            select(_link_table.c.campaign_id, *(_event_table.c[f] for f in event_fields))
+            .join(_event_table, _event_table.c.id == _link_table.c.event_option_id)
+            .where(_link_table.c.campaign_id.in_(ids))
+        )
+        for campaign_id, *values in rows:
+            docs[campaign_id]["event_options"].append(dict(zip(event_fields, values)))
+
+    if "stretch_goals" in fieldset.relations:
+        goal_fields = fieldset.relations["stretch_goals"]
+        rows = conn.execute(
+            select(_goal_table.c.campaign_id, *(_goal_table.c[f] for f in goal_fields))
+            .where(_goal_table.c.campaign_id.in_(ids))
+        )
+        for campaign_id, *values in rows:
+            docs[campaign_id]["stretch_goals"].append(dict(zip(goal_fields, values)))
+
+    if "private_contributions" in fieldset.relations:
+        contribution_fields = fieldset.relations["private_contributions"]
+        rows = conn.execute(
+            select(_contribution_table.c.campaign_id, *(_contribution_table.c[f] for f in contribution_fields))
+            .where(_contribution_table.c.campaign_id.in_(ids))
+        )
+        for campaign_id, *values in rows:
+            docs[campaign_id]["private_contributions"].append(dict(zip(contribution_fields, values)))
+
+    return [docs[campaign_id] for campaign_id in campaign_ids if campaign_id in docs]
+
+
+def load_campaign_documents_normalized(
+    session: Session,
+    campaign_ids: Sequence[str],
+    fieldset: FieldSet = FULL_FIELDSET,
+) -> Dict[str, Any]:
+    """
+    Build a CampaignListNormalized-shaped dict for the given ids, preserving their order.
+
+    Campaigns carry event_option_ids; each linked event option is selected once and
+    returned in the event_options map. Without the event_options relation in the
+    FieldSet both stay empty.
+    """
+    relations = {r: f for r, f in fieldset.relations.items() if r != "event_options"}
+    docs = load_campaign_documents(session, campaign_ids, fieldset._replace(relations=relations))
+    if "event_options" not in fieldset.relations or not docs:
+        return {"campaigns": docs, "event_options": {}}
+    conn = session.connection()
+
+    by_id = {doc["id"]: doc for doc in docs}
+    for doc in docs:
+        doc["event_option_ids"] = []
+    rows = conn.execute(
+        select(_link_table.c.campaign_id, _link_table.c.event_option_id).where(_link_table.c.campaign_id.in_(list(by_id)))
+    )
+    for campaign_id, event_option_id in rows:
+        by_id[campaign_id]["event_option_ids"].append(event_option_id)
+
+    event_fields = fieldset.relations["event_options"]
+    linked = select(_link_table.c.event_option_id).where(_link_table.c.campaign_id.in_(list(by_id)))
+    rows = conn.execute(select(*(_event_table.c[f] for f in event_fields)).where(_event_table.c.id.in_(linked)))
+    events = {event["id"]: event for event in (dict(zip(event_fields, row)) for row in rows)}
+    return {"campaigns": docs, "event_options": events}
+
+
+def load_campaign_document(session: Session, campaign_id: str) -> Optional[CampaignDocument]:
+    docs = load_campaign_documents(session, [campaign_id])
+    return docs[0] if docs else None
+
+
+def voter_key(vote_table=_vote_table):
+    """Distinct-voter expression: registered users and anonymous sessions never collide."""
+    return func.coalesce(literal("u:") + vote_table.c.user_id, literal("s:") + vote_table.c.session_id)
+
+
+def voter_key_value(user_id: Optional[str], session_id: Optional[str]) -> Optional[str]:
+    """voter_key for values in Python."""
+    if user_id is not None:
+        return f"u:{user_id}"
+    if session_id is not None:
+        return f"s:{session_id}"
+    return None
+
+
+def load_campaign_summaries(session: Session, campaign_ids: Sequence[str]) -> List[CampaignDocument]:
+    """
+    Build CampaignSummary-shaped dicts for the given ids, preserving their order.
+
+    One statement; each aggregate is a correlated subquery answered from a covering
+    (campaign_id, ...) index, so no child rows leave SQLite and the response is
+    O(campaigns) instead of O(all child rows).
+    """
+    if not campaign_ids:
+        return []
+    c, pc, v, sg = _campaign_table, _contribution_table, _vote_table, _goal_table
+
+    private_total = (
+        select(func.coalesce(func.sum(pc.c.amount), 0.0)).where(pc.c.campaign_id == c.c.id).scalar_subquery()
+    )
+    total_funded = c.c.company_budget_available + c.c.external_sponsors + private_total
+    # Same cap as getFundingPercentage in the frontend
+    funding_percentage = case(
+        (c.c.total_budget_needed > 0, func.min(total_funded * 100.0 / c.c.total_budget_needed, 150.0)),
+        else_=0.0,
+    )
+    aggregates = {
+        "total_funded": total_funded,
+        "funding_percentage": funding_percentage,
+        "contribution_count": select(func.count()).where(pc.c.campaign_id == c.c.id).scalar_subquery(),
+        "vote_count": select(func.count()).where(v.c.campaign_id == c.c.id).scalar_subquery(),
+        "voter_count": select(func.count(func.distinct(voter_key(v)))).where(v.c.campaign_id == c.c.id).scalar_subquery(),
+        "unlocked_stretch_goal_count": select(func.count())
+        .where(sg.c.campaign_id == c.c.id, sg.c.unlocked.is_(True))
+        .scalar_subquery(),
+    }
+    columns = [aggregates[f] if f in aggregates else c.c[f] for f in SUMMARY_FIELDS]
+
+    rows = session.connection().execute(select(*columns).where(c.c.id.in_(campaign_ids)))
+    docs = {doc["id"]: doc for doc in (dict(zip(SUMMARY_FIELDS, row)) for row in rows)}
+    return [docs[campaign_id] for campaign_id in campaign_ids if campaign_id in docs]
@@ -0,0 +1,113 @@
+"""
+Department dashboard: aggregates across all campaigns of a department.
+
+Five statements (plus the headcount lookup), each restricted to the department's
+campaigns through the indexed dept_code / campaign_id columns:
+
+1. campaign count and budget per status (GROUP BY status)
+2. private contributions total
+3. voting deadlines of campaigns still in voting
+4. vote count; distinct voters come from the merged HyperLogLog voter sketches
+   of the department's campaigns (app.services.participation)
+5. top events by positive vote weight, from campaign_event_tally (GROUP BY event)
+
+The result is cached per department and dropped by invalidate_department after
+any change to one of its campaigns. upcoming_deadlines holds every voting
+deadline; the route cuts it to the ones still ahead at request time, so the
+cached value does not depend on the clock.
+"""
+from sqlalchemy import and_, exists, func, select
+from sqlmodel import Session
+
+from app.models import Campaign, CampaignEventOption, CampaignEventTally, CampaignStatus, EventOption, PrivateContribution, Vote
+from app.schemas.domain import DashboardDeadline, DashboardEvent, DepartmentDashboard
+from app.services.participation import department_voter_sketches, participation_rate, resolve_headcounts
+
+TOP_EVENTS = 5
+
+_campaign_table = Campaign.__table__
+_contribution_table = PrivateContribution.__table__
+_vote_table = Vote.__table__
+_tally_table = CampaignEventTally.__table__
+_event_table = EventOption.__table__
+_link_table = CampaignEventOption.__table__
+
+
+def build_department_dashboard(session: Session, dept_code: str) -> DepartmentDashboard:
+    conn = session.connection()
+    c = _campaign_table
+    department_campaigns = select(c.c.id).where(c.c.dept_code == dept_code)
+
+    status_counts = {status: 0 for status in CampaignStatus}
+    total_budget_needed = 0.0
+    total_funded = 0.0
+    rows = conn.execute(
+        select(
+            c.c.status,
+            func.count(),
+            func.sum(c.c.total_budget_needed),
+            func.sum(c.c.company_budget_available + c.c.external_sponsors),
+        )
+        .where(c.c.dept_code == dept_code)
+        .group_by(c.c.status)
+    )
+    for status, count, needed, funded in rows:
+        status_counts[CampaignStatus(status)] = count
+        total_budget_needed += needed or 0
+        total_funded += funded or 0
+
+    pc = _contribution_table
+    total_funded += conn.execute(
+        select(func.coalesce(func.sum(pc.c.amount), 0.0)).where(pc.c.campaign_id.in_(department_campaigns))
+    ).scalar_one()
+    # Same cap as getFundingPercentage in the frontend
+    funding_percentage = min(total_funded * 100.0 / total_budget_needed, 150.0) if total_budget_needed > 0 else 0.0
+
+    deadlines = [
+        DashboardDeadline(campaign_id=campaign_id, name=name, voting_deadline=deadline)
+        for campaign_id, name, deadline in conn.execute(
+            select(c.c.id, c.c.name, c.c.voting_deadline)
+            .where(
+                c.c.dept_code == dept_code,
+                c.c.status == CampaignStatus.voting,
+                c.c.voting_deadline.is_not(None),
+            )
+            .order_by(c.c.voting_deadline, c.c.id)
+        )
+    ]
+
+    v = _vote_table
+    vote_count = conn.execute(select(func.count()).where(v.c.campaign_id.in_(department_campaigns))).scalar_one()
+    sketch = department_voter_sketches(session, [dept_code]).get(dept_code)
+    voter_count = sketch.count() if sketch is not None else 0
+    headcount = resolve_headcounts(session, [dept_code])[dept_code]
+
+    t, e, link = _tally_table, _event_table, _link_table
+    weight = func.sum(t.c.positive_weight).label("weight")
+    linked = exists().where(and_(link.c.campaign_id == t.c.campaign_id, link.c.event_option_id == t.c.event_id))
+    top_events = [
+        DashboardEvent(event_id=event_id, title=title, category=category, weight=total, voter_count=voters)
+        for event_id, title, category, total, voters in conn.execute(
+            select(e.c.id, e.c.title, e.c.category, weight, func.sum(t.c.voter_count))
+            .join(e, e.c.id == t.c.event_id)
+            .where(t.c.campaign_id.in_(department_campaigns), t.c.positive_weight > 0, linked)
+            .group_by(e.c.id, e.c.title, e.c.category)
+            .order_by(weight.desc(), e.c.id)
+            .limit(TOP_EVENTS)
+        )
+    ]
+
+    return DepartmentDashboard(
+        dept_code=dept_code,
+        campaign_count=sum(status_counts.values()),
+        status_counts=status_counts,
+        total_budget_needed=total_budget_needed,
+        total_funded=total_funded,
+        funding_percentage=funding_percentage,
+        upcoming_deadlines=deadlines,
+        vote_count=vote_count,
+        voter_count=voter_count,
+        headcount=headcount,
+        participation_rate=participation_rate(voter_count, headcount),
+        top_events=top_events,
+    )
@@ -0,0 +1,151 @@
+"""
+Streaming NDJSON export of a department (HR reporting).
+
+Campaigns are read in keyset pages of (created_at, id). For every page the
+campaign rows are written first, then the votes, availability entries and
+private contributions of those campaigns, each read in keyset batches of
+(campaign_id, id). Every page and batch is fetched completely before its lines
+are yielded, so no cursor (and, on SQLite, no shared lock blocking writers)
+stays open while a slow client drains the response. Memory is bounded by the
+page and batch size no matter how large the department is.
+
+Every line is one JSON object with a "type" of campaign, vote, availability or
+contribution. user_id and session_id are never exported: they are the only
+credential for replacing votes and availability. Votes and availability carry a
+"participant" pseudonym instead (keyed hash of the voter key, stable per
+SECRET_KEY), so entries of the same person can still be grouped.
+
+After each complete page a checkpoint line carries the cursor to resume from;
+records after the last checkpoint are repeated on resume, so consumers should
+treat them as upserts by id.
+"""
+import hashlib
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+
+import orjson
+from sqlalchemy import select
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.database import engine
+from app.core.pagination import apply_keyset, split_page
+from app.models import Availability, Campaign, PrivateContribution, Vote
+from app.services.availability import mask_to_slots
+from app.services.campaign_reads import voter_key_value
+
+EXPORT_PAGE_SIZE = 200
+CHILD_BATCH_SIZE = 1000
+
+_campaign_table = Campaign.__table__
+_CAMPAIGN_KEY = (_campaign_table.c.created_at, _campaign_table.c.id)
+# Explicit column lists: user_id and session_id only feed the participant pseudonym
+_CHILD_TABLES = (
+    ("vote", Vote.__table__, ("id", "campaign_id", "event_id", "weight", "is_super_like", "created_at")),
+    ("availability", Availability.__table__, ("id", "campaign_id", "date", "slot_mask", "created_at")),
+    (
+        "contribution",
+        PrivateContribution.__table__,
+        ("id", "campaign_id", "user_name", "amount", "is_hero", "is_anonymous", "badge", "created_at"),
+    ),
+)
+
+
+def _pseudonym(user_id: Optional[str], session_id: Optional[str]) -> Optional[str]:
+    key = voter_key_value(user_id, session_id)
+    if key is None:
+        return None
+    secret = get_settings().secret_key.encode("utf-8")[:64]  # blake2b keys are at most 64 bytes
+    return hashlib.blake2b(key.encode("utf-8"), key=secret, digest_size=16).hexdigest()
+
+
+def _child_columns(table, names) -> list:
+    columns = [table.c[name] for name in names]
+    if "user_id" in table.c:
+        columns += [table.c.user_id, table.c.session_id]
+    return columns
+
+
+def _line(record_type: str, row: Any) -> bytes:
+    record = {"type": record_type, **row._mapping}
+    if "session_id" in record:
+        record["participant"] = _pseudonym(record.pop("user_id"), record.pop("session_id"))
+    if record_type == "availability":
+        # Keep the slot names of the API rather than the stored bitmask
+        record["slots"] = mask_to_slots(record.pop("slot_mask"))
+    return orjson.dumps(record) + b"\n"
+
+
+def validate_export_cursor(cursor: Optional[str]) -> None:
+    """Raises ValueError for malformed cursors before a response is started."""
+    apply_keyset(select(_campaign_table.c.id), _CAMPAIGN_KEY, cursor, None)
+
+
+def iter_department_export(
+    dept_code: str,
+    cursor: Optional[str] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[bytes]:
+    """
+    Yield NDJSON lines for all campaigns of a department after cursor.
+
+    Opens its own session: the generator outlives the request's dependencies.
+    """
+    with Session(engine) as session:
+        conn = session.connection()
+        while True:
+            stmt = apply_keyset(
+                select(_campaign_table).where(_campaign_table.c.dept_code == dept_code),
+                _CAMPAIGN_KEY,
+                cursor,
+                page_size,
+            )
+            campaigns, cursor = split_page(conn.execute(stmt).all(), page_size, key=lambda r: (r.created_at, r.id))
+            if not campaigns:
+                return
+            for campaign in campaigns:
+                yield _line("campaign", campaign)
+
+            ids = [c.id for c in campaigns]
+            for record_type, table, names in _CHILD_TABLES:
+                child_cursor = None
+                while True:
+                    stmt = apply_keyset(
+                        select(*_child_columns(table, names)).where(table.c.campaign_id.in_(ids)),
+                        (table.c.campaign_id, table.c.id),
+                        child_cursor,
+                        CHILD_BATCH_SIZE,
+                    )
+                    rows, child_cursor = split_page(
+                        conn.execute(stmt).all(), CHILD_BATCH_SIZE, key=lambda r: (r.campaign_id, r.id)
+                    )
+                    for row in rows:
+                        yield _line(record_type, row)
+                    if child_cursor is None:
+                        break
+
+            yield orjson.dumps({"type": "checkpoint", "cursor": cursor}) + b"\n"
+            if cursor is None:
+                return
+
+
+def buffered(chunks: Iterable[bytes], min_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Join small chunks (single lines) into fewer, larger response writes."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= min_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream incrementally into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,171 @@
+"""
+Event feature index: numeric features of every catalog event, built once per
+catalog version.
+
+Analytics, rollups and catalog filtering need the same handful of derived values
+per event (category, normalized tags, levels, price, group size). Instead of
+re-deriving them from EventOption rows per vote or per request, FeatureIndex holds
+them as NumPy arrays aligned by event position:
+
+- category:      integer code (index into CATEGORIES)
+- tag_bits:      normalized (lower-case, stripped) tags as a bitset per event, one
+                 bit per tag in the index vocabulary
+- intensity, mental, social: physical_intensity, mental_challenge and
+                 social_interaction_level (1-5, 0 = unknown)
+- price_bucket:  index into PRICE_BUCKETS by est_price_pp
+- group_min / group_max: recommended group size range (min_participants and no
+                 upper bound when not given)
+
+get_feature_index() rebuilds the process-local index whenever the CATALOG cache
+namespace is invalidated, which happens after every committed EventOption change
+(see app.services.caching), so all workers follow catalog edits.
+"""
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.cache import get_cache
+from app.core.database import session_scope
+from app.models import EventCategory, EventOption
+from app.services.caching import CATALOG
+
+CATEGORIES = [category.value for category in EventCategory]
+# Upper bounds (EUR per person) of the price buckets; the last bucket is open-ended
+PRICE_BUCKETS = (25.0, 50.0, 100.0, 200.0)
+UNBOUNDED_GROUP_SIZE = np.iinfo(np.int32).max
+
+_event_table = EventOption.__table__
+
+
+def normalize_tag(tag: str) -> str:
+    return tag.strip().lower()
+
+
+def price_bucket(price: float) -> int:
+    return bisect.bisect_left(PRICE_BUCKETS, price)
+
+
+class FeatureIndex:
+    """Feature arrays of all catalog events, aligned by position."""
+
+    def __init__(self, rows: Sequence[Dict]) -> None:
+        self.ids: List[str] = [row["id"] for row in rows]
+        self.position: Dict[str, int] = {event_id: i for i, event_id in enumerate(self.ids)}
+
+        self.tag_vocabulary: Dict[str, int] = {}
+        tag_bits: List[int] = []
+        for row in rows:
+            bits = 0
+            for tag in row["tags"] or []:
+                bit = self.tag_vocabulary.setdefault(normalize_tag(tag), len(self.tag_vocabulary))
+                bits |= 1 << bit
+            tag_bits.append(bits)
+        # Python ints: the vocabulary may exceed 64 tags
+        self.tag_bits = np.array(tag_bits, dtype=object)
+
+        def levels(column: str) -> np.ndarray:
+            return np.array([row[column] or 0 for row in rows], dtype=np.int8)
+
+        self.category = np.array([CATEGORIES.index(EventCategory(row["category"]).value) for row in rows], dtype=np.int8)
+        self.intensity = levels("physical_intensity")
+        self.mental = levels("mental_challenge")
+        self.social = levels("social_interaction_level")
+        self.price_bucket = np.array([price_bucket(row["est_price_pp"]) for row in rows], dtype=np.int8)
+        self.group_min = np.array(
+            [row["recommended_group_size_min"] or row["min_participants"] or 1 for row in rows], dtype=np.int32
+        )
+        self.group_max = np.array(
+            [row["recommended_group_size_max"] or UNBOUNDED_GROUP_SIZE for row in rows], dtype=np.int32
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def tag_mask(self, tags: Iterable[str]) -> Optional[int]:
+        """Bitset of the given tags; None if one of them occurs in no event."""
+        mask = 0
+        for tag in tags:
+            bit = self.tag_vocabulary.get(normalize_tag(tag))
+            if bit is None:
+                return None
+            mask |= 1 << bit
+        return mask
+
+    def tag_flags(self, tag: str) -> np.ndarray:
+        """Boolean array: which events carry the tag."""
+        mask = self.tag_mask([tag])
+        if mask is None:
+            return np.zeros(len(self), dtype=bool)
+        return (self.tag_bits & mask).astype(bool)
+
+    def positions(self, event_ids: Iterable[str]) -> np.ndarray:
+        """Positions of known event ids (unknown ids are dropped)."""
+        return np.array([self.position[e] for e in event_ids if e in self.position], dtype=np.intp)
+
+    def filter(
+        self,
+        category: Optional[str] = None,
+        tags: Sequence[str] = (),
+        max_price_bucket: Optional[int] = None,
+        group_size: Optional[int] = None,
+        max_intensity: Optional[int] = None,
+        min_social: Optional[int] = None,
+    ) -> List[str]:
+        """Ids of events matching all given criteria (unknown levels never match a bound)."""
+        matches = np.ones(len(self), dtype=bool)
+        if category is not None:
+            matches &= self.category == CATEGORIES.index(category)
+        if tags:
+            mask = self.tag_mask(tags)
+            if mask is None:
+                return []
+            matches &= (self.tag_bits & mask) == mask
+        if max_price_bucket is not None:
+            matches &= self.price_bucket <= max_price_bucket
+        if group_size is not None:
+            matches &= (self.group_min <= group_size) & (group_size <= self.group_max)
+        if max_intensity is not None:
+            matches &= (self.intensity > 0) & (self.intensity <= max_intensity)
+        if min_social is not None:
+            matches &= self.social >= min_social
+        return [self.ids[i] for i in np.flatnonzero(matches)]
+
+
+_COLUMNS = (
+    "id",
+    "category",
+    "tags",
+    "physical_intensity",
+    "mental_challenge",
+    "social_interaction_level",
+    "est_price_pp",
+    "min_participants",
+    "recommended_group_size_min",
+    "recommended_group_size_max",
+)
+
+_lock = threading.Lock()
+_index: Optional[FeatureIndex] = None
+_generation: Optional[int] = None
+
+
+def _rebuild() -> FeatureIndex:
+    global _index, _generation
+    generation = get_cache().generation(CATALOG)
+    with session_scope() as session:
+        rows = session.connection().execute(select(*(_event_table.c[c] for c in _COLUMNS))).mappings().all()
+    index = FeatureIndex(rows)
+    with _lock:
+        _index, _generation = index, generation
+    return index
+
+
+def get_feature_index() -> FeatureIndex:
+    """The feature index of the current catalog version (rebuilt at most once per version)."""
+    cache = get_cache()
+    if _index is None or _generation != cache.generation(CATALOG):
+        return cache.flights.do("features:catalog", _rebuild)[0]
+    return _index
@@ -0,0 +1,98 @@
+"""
+Per-event leaderboard of a campaign, from the vote tally.
+
+One query returns every event option linked to the campaign with its
+campaign_event_tally row, so the cost is bounded by the number of linked events,
+not votes. heapq.nsmallest picks the top k by:
+
+1. events with votes before events without (a net negative score still ranks
+   above no votes at all)
+2. weighted score (sum of vote weights), descending
+3. super likes, descending
+4. approval ratio (positive share of the absolute vote weight), descending
+5. distinct voters, descending
+6. event id, ascending
+
+The last key makes the order total, so equal scores always rank the same way
+and the winner is reproducible.
+"""
+import heapq
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlmodel import Session
+
+from app.models import CampaignEventOption, CampaignEventTally, EventOption
+from app.schemas.domain import LeaderboardEntry
+
+DEFAULT_TOP_K = 10
+
+_tally_table = CampaignEventTally.__table__
+_event_table = EventOption.__table__
+_link_table = CampaignEventOption.__table__
+
+
+def approval_ratio(positive_weight: int, weight_sum: int) -> float:
+    """Positive share of the absolute vote weight (0.0 without votes)."""
+    # negative weight = weight_sum - positive_weight
+    absolute = 2 * positive_weight - weight_sum
+    return positive_weight / absolute if absolute else 0.0
+
+
+def _rank_key(entry: LeaderboardEntry) -> Tuple:
+    return (
+        entry.vote_count == 0,
+        -entry.score,
+        -entry.super_like_count,
+        -entry.approval_ratio,
+        -entry.voter_count,
+        entry.event_id,
+    )
+
+
+def load_leaderboard(session: Session, campaign_id: str, top_k: Optional[int] = DEFAULT_TOP_K) -> List[LeaderboardEntry]:
+    """Top k linked events of a campaign, ranked (all of them if top_k is None)."""
+    t, e, link = _tally_table, _event_table, _link_table
+    # A campaign may link the same event twice; rank it once
+    linked = select(link.c.event_option_id.label("event_id")).where(link.c.campaign_id == campaign_id).distinct().subquery()
+    rows = session.connection().execute(
+        select(
+            e.c.id,
+            e.c.title,
+            e.c.category,
+            t.c.weight_sum,
+            t.c.positive_weight,
+            t.c.super_like_count,
+            t.c.vote_count,
+            t.c.voter_count,
+        )
+        .select_from(linked)
+        .join(e, e.c.id == linked.c.event_id)
+        .outerjoin(t, and_(t.c.campaign_id == campaign_id, t.c.event_id == linked.c.event_id))
+    )
+    entries = [
+        LeaderboardEntry(
+            rank=0,
+            event_id=event_id,
+            title=title,
+            category=category,
+            score=weight_sum or 0,
+            super_like_count=super_likes or 0,
+            approval_ratio=round(approval_ratio(positive or 0, weight_sum or 0), 4),
+            vote_count=votes or 0,
+            voter_count=voters or 0,
+        )
+        for event_id, title, category, weight_sum, positive, super_likes, votes, voters in rows
+    ]
+    ranked = sorted(entries, key=_rank_key) if top_k is None else heapq.nsmallest(top_k, entries, key=_rank_key)
+    for rank, entry in enumerate(ranked, start=1):
+        entry.rank = rank
+    return ranked
+
+
+def pick_winner(session: Session, campaign_id: str) -> Optional[LeaderboardEntry]:
+    """The first leaderboard entry, or None while no linked event has votes."""
+    top = load_leaderboard(session, campaign_id, top_k=1)
+    if not top or top[0].vote_count == 0:
+        return None
+    return top[0]
@@ -0,0 +1,128 @@
+"""
+Participation: distinct voters relative to the department's headcount.
+
+- Single campaign: exact COUNT(DISTINCT voter_key) over ix_vote_campaign_voter
+  (campaign_id, user_id, session_id), answered from the index alone.
+- Department-wide and company-wide: every campaign keeps a HyperLogLog sketch of
+  its voters (campaign_voter_sketch), updated by submit_votes. Rollups merge the
+  sketches of the campaigns involved instead of scanning votes; a voter who takes
+  part in several campaigns is counted once.
+
+Headcount per department: Department.headcount if set, otherwise the number of
+UserProfile rows of the department, otherwise settings.default_department_headcount.
+Sketches only grow: a voter who withdraws all votes still counts as having taken
+part, which is what participation measures.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.hyperloglog import HyperLogLog
+from app.models import Campaign, CampaignVoterSketch, Department, UserProfile, Vote
+from app.services.campaign_reads import voter_key
+
+_campaign_table = Campaign.__table__
+_department_table = Department.__table__
+_profile_table = UserProfile.__table__
+_sketch_table = CampaignVoterSketch.__table__
+_vote_table = Vote.__table__
+
+
+def participation_rate(voters: int, headcount: int) -> int:
+    """Percentage of the headcount that voted, capped at 100 (anonymous sessions can exceed it)."""
+    if headcount <= 0:
+        return 0
+    return min(100, round(voters * 100 / headcount))
+
+
+def resolve_headcounts(session: Session, dept_codes: Iterable[str]) -> Dict[str, int]:
+    dept_codes = list(dept_codes)
+    if not dept_codes:
+        return {}
+    conn = session.connection()
+    configured = dict(
+        conn.execute(
+            select(_department_table.c.dept_code, _department_table.c.headcount).where(
+                _department_table.c.dept_code.in_(dept_codes), _department_table.c.headcount.is_not(None)
+            )
+        ).all()
+    )
+    profiles = dict(
+        conn.execute(
+            select(_profile_table.c.dept_code, func.count())
+            .where(_profile_table.c.dept_code.in_(dept_codes))
+            .group_by(_profile_table.c.dept_code)
+        ).all()
+    )
+    default = get_settings().default_department_headcount
+    return {code: configured.get(code) or profiles.get(code) or default for code in dept_codes}
+
+
+def campaign_voter_count(session: Session, campaign_id: str) -> int:
+    v = _vote_table
+    return session.connection().execute(
+        select(func.count(func.distinct(voter_key(v)))).where(v.c.campaign_id == campaign_id)
+    ).scalar_one()
+
+
+def campaign_participation(session: Session, campaign_id: str, dept_code: str) -> int:
+    headcount = resolve_headcounts(session, [dept_code])[dept_code]
+    return participation_rate(campaign_voter_count(session, campaign_id), headcount)
+
+
+def record_voter(session: Session, campaign_id: str, key: Optional[str]) -> None:
+    """Add a voter key to the campaign's sketch. Does not commit."""
+    if key is None:
+        return
+    conn = session.connection()
+    registers = conn.execute(
+        select(_sketch_table.c.registers).where(_sketch_table.c.campaign_id == campaign_id)
+    ).scalar_one_or_none()
+    sketch = HyperLogLog(registers=registers)
+    if not sketch.add(key) and registers is not None:
+        return
+    if registers is None:
+        conn.execute(_sketch_table.insert().values(campaign_id=campaign_id, registers=sketch.to_bytes()))
+    else:
+        conn.execute(
+            _sketch_table.update()
+            .where(_sketch_table.c.campaign_id == campaign_id)
+            .values(registers=sketch.to_bytes())
+        )
+
+
+def delete_voter_sketch(session: Session, campaign_id: str) -> None:
+    session.connection().execute(delete(_sketch_table).where(_sketch_table.c.campaign_id == campaign_id))
+
+
+def rebuild_voter_sketches(session: Session) -> int:
+    """Recompute every campaign's sketch from the vote table. Does not commit."""
+    conn = session.connection()
+    sketches: Dict[str, HyperLogLog] = defaultdict(HyperLogLog)
+    v = _vote_table
+    rows = conn.execute(select(v.c.campaign_id, voter_key(v)).distinct().execution_options(yield_per=5000))
+    for campaign_id, key in rows:
+        if key is not None:
+            sketches[campaign_id].add(key)
+    conn.execute(delete(_sketch_table))
+    if sketches:
+        conn.execute(
+            _sketch_table.insert(),
+            [{"campaign_id": campaign_id, "registers": s.to_bytes()} for campaign_id, s in sketches.items()],
+        )
+    return len(sketches)
+
+
+def department_voter_sketches(session: Session, dept_codes: Optional[List[str]] = None) -> Dict[str, HyperLogLog]:
+    """Merged voter sketch per department (one query over the campaign sketches)."""
+    c, s = _campaign_table, _sketch_table
+    stmt = select(c.c.dept_code, s.c.registers).join(c, c.c.id == s.c.campaign_id)
+    if dept_codes is not None:
+        stmt = stmt.where(c.c.dept_code.in_(dept_codes))
+    merged: Dict[str, HyperLogLog] = defaultdict(HyperLogLog)
+    for dept_code, registers in session.connection().execute(stmt):
+        merged[dept_code].merge(HyperLogLog(registers=registers))
+    return dict(merged)
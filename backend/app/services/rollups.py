@@ -0,0 +1,157 @@
+"""
+Department and company analytics computed in batch with NumPy.
+
+build_team_analytics scores one campaign at a time. For the department and company
+views every department is scored at once: the positive vote weight of all
+campaigns is read from campaign_event_tally (one row per campaign and voted event),
+event features come from the feature index (app.services.features), and per-department
+category scores, outdoor weight and first-vote times are accumulated with
+np.add.at / np.minimum.at into (departments x categories) matrices. The scoring
+rules of score_team_analytics are then applied column-wise to all departments.
+Participation merges the departments' HyperLogLog voter sketches (see
+app.services.participation) against their headcounts.
+
+A department's metrics equal build_team_analytics over the pooled votes of all its
+campaigns; the company row pools every department.
+"""
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import and_, exists, select
+from sqlmodel import Session
+
+from app.core.hyperloglog import HyperLogLog
+from app.models import Campaign, CampaignEventOption, CampaignEventTally, Department
+from app.schemas.domain import DepartmentAnalytics, TeamAnalytics
+from app.services.features import CATEGORIES, get_feature_index
+from app.services.participation import department_voter_sketches, participation_rate, resolve_headcounts
+
+_tally_table = CampaignEventTally.__table__
+_campaign_table = Campaign.__table__
+_link_table = CampaignEventOption.__table__
+
+
+class VoteMatrix(NamedTuple):
+    """Positive vote weight per department and category plus outdoor weight per department."""
+
+    dept_codes: List[str]
+    category_scores: np.ndarray  # (departments, categories)
+    first_voted: np.ndarray  # (departments, categories), epoch seconds, inf if never voted
+    outdoor_votes: np.ndarray  # (departments,)
+
+
+def load_vote_matrix(session: Session) -> VoteMatrix:
+    """Accumulate all tally rows into per-department matrices (one query)."""
+    conn = session.connection()
+    index = get_feature_index()
+    event_index = index.position
+    event_category = index.category.astype(np.intp)
+    event_outdoor = index.tag_flags("outdoor")
+
+    t, c, link = _tally_table, _campaign_table, _link_table
+    linked = exists().where(and_(link.c.campaign_id == t.c.campaign_id, link.c.event_option_id == t.c.event_id))
+    rows = conn.execute(
+        select(c.c.dept_code, t.c.event_id, t.c.positive_weight, t.c.first_voted_at)
+        .join(c, c.c.id == t.c.campaign_id)
+        .where(t.c.positive_weight > 0, linked)
+    ).all()
+    rows = [row for row in rows if row[1] in event_index]
+
+    dept_codes = sorted({row[0] for row in rows})
+    dept_index = {code: i for i, code in enumerate(dept_codes)}
+    shape = (len(dept_codes), len(CATEGORIES))
+    category_scores = np.zeros(shape, dtype=np.int64)
+    first_voted = np.full(shape, np.inf)
+    outdoor_votes = np.zeros(len(dept_codes), dtype=np.int64)
+    if not rows:
+        return VoteMatrix(dept_codes, category_scores, first_voted, outdoor_votes)
+
+    depts = np.fromiter((dept_index[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+    event_ids = np.fromiter((event_index[row[1]] for row in rows), dtype=np.intp, count=len(rows))
+    weights = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows))
+    voted_at = np.fromiter((row[3].timestamp() for row in rows), dtype=np.float64, count=len(rows))
+
+    categories = event_category[event_ids]
+    np.add.at(category_scores, (depts, categories), weights)
+    np.minimum.at(first_voted, (depts, categories), voted_at)
+    np.add.at(outdoor_votes, depts, weights * event_outdoor[event_ids])
+    return VoteMatrix(dept_codes, category_scores, first_voted, outdoor_votes)
+
+
+def _column(scores: np.ndarray, name: str) -> np.ndarray:
+    # Same lookups as score_team_analytics, including names that match no category
+    if name in CATEGORIES:
+        return scores[:, CATEGORIES.index(name)]
+    return np.zeros(scores.shape[0], dtype=scores.dtype)
+
+
+def score_vote_matrix(
+    scores: np.ndarray,
+    first_voted: np.ndarray,
+    outdoor_votes: np.ndarray,
+    participation: Optional[Sequence[int]] = None,
+) -> List[TeamAnalytics]:
+    """score_team_analytics applied to every row of the matrices at once."""
+    total = scores.sum(axis=1)
+    has_votes = total > 0
+    safe_total = np.where(has_votes, total, 1)
+
+    action_level = np.where(has_votes, np.round(_column(scores, "Action") / safe_total * 100), 25).astype(int)
+    food_focus = np.where(has_votes, np.round(_column(scores, "Food") / safe_total * 100), 30).astype(int)
+    outdoor_wish = np.where(has_votes, np.round(outdoor_votes / safe_total * 100), 20).astype(int)
+
+    # Ranking: highest score first, ties by first vote (Counter.most_common insertion order)
+    order = np.lexsort((first_voted, -scores), axis=1)
+    voted = scores > 0
+    top_value = scores.max(axis=1)
+    bottom_value = np.where(voted, scores, top_value[:, None]).min(axis=1)
+    spread = np.floor((top_value - bottom_value) / (top_value + bottom_value + 1) * 100).astype(int)
+    compromise_score = np.where(has_votes, np.clip(100 - spread, 40, 100), 85)
+
+    relax_over_action = _column(scores, "Relax") > _column(scores, "Action")
+    results = []
+    for i in range(scores.shape[0]):
+        if action_level[i] > 50:
+            persona_label, persona_description = "Team Adrenalin-Junkies", "Action und Abenteuer stehen ganz oben."
+        elif food_focus[i] > 50:
+            persona_label, persona_description = "Team Foodies", "Essen und Genuss priorisieren alles."
+        elif relax_over_action[i]:
+            persona_label, persona_description = "Team Chill & Grill", "Entspannung und gutes Essen sind Favoriten."
+        else:
+            persona_label, persona_description = "Die Ausgewogenen", "Euer Team mag Vielfalt und findet Kompromisse."
+        top_categories = [CATEGORIES[j] for j in order[i] if voted[i, j]][:2] or ["Action", "Food"]
+        results.append(
+            TeamAnalytics(
+                action_level=int(action_level[i]),
+                food_focus=int(food_focus[i]),
+                outdoor_wish=int(outdoor_wish[i]),
+                compromise_score=int(compromise_score[i]),
+                persona_label=persona_label,
+                persona_description=persona_description,
+                top_categories=top_categories,
+                participation_rate=(90 if has_votes[i] else 80) if participation is None else participation[i],
+            )
+        )
+    return results
+
+
+def build_department_analytics(session: Session) -> DepartmentAnalytics:
+    matrix = load_vote_matrix(session)
+    sketches = department_voter_sketches(session)
+    # Company headcount covers every department, also those without votes yet
+    all_depts = session.connection().execute(select(Department.__table__.c.dept_code)).scalars().all()
+    headcounts = resolve_headcounts(session, set(all_depts) | set(matrix.dept_codes))
+    departments = score_vote_matrix(
+        matrix.category_scores,
+        matrix.first_voted,
+        matrix.outdoor_votes,
+        [participation_rate(sketches[code].count() if code in sketches else 0, headcounts[code]) for code in matrix.dept_codes],
+    )
+    company_voters = HyperLogLog.union(sketches.values()).count()
+    (company,) = score_vote_matrix(
+        matrix.category_scores.sum(axis=0, keepdims=True),
+        matrix.first_voted.min(axis=0, keepdims=True, initial=np.inf),
+        matrix.outdoor_votes.sum(keepdims=True),
+        [participation_rate(company_voters, sum(headcounts.values()))],
+    )
+    return DepartmentAnalytics(company=company, departments=dict(zip(matrix.dept_codes, departments)))
@@ -0,0 +1,184 @@
+"""
+Materialized vote tally per campaign and event (campaign_event_tally).
+
+submit_votes replaces a voter's votes; apply_vote_replacement turns that into
+per-event deltas (weight sum, positive weight, super likes, votes, distinct
+voters) and upserts them in the same transaction. Readers such as analytics then
+touch O(events) tally rows instead of O(votes) vote rows.
+
+Distinct voters use the same key as campaign_reads.voter_key ("u:<user_id>",
+otherwise "s:<session_id>"). Whether a voter still has other votes on an event
+after the replacement is checked with one indexed query on the touched keys.
+
+rebuild_tally recomputes rows from the vote table, verify_tally reports where the
+maintained rows disagree with it (see scripts/rebuild_tally.py).
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session
+
+from app.models import CampaignEventTally, Vote
+from app.services.campaign_reads import voter_key, voter_key_value
+
+TALLY_COLUMNS = ("weight_sum", "positive_weight", "super_like_count", "vote_count", "voter_count")
+
+_tally_table = CampaignEventTally.__table__
+_vote_table = Vote.__table__
+
+
+def _voter_clause(key: str) -> Any:
+    kind, value = key[0], key[2:]
+    if kind == "u":
+        return _vote_table.c.user_id == value
+    return and_(_vote_table.c.user_id.is_(None), _vote_table.c.session_id == value)
+
+
+def _remaining_voters(session: Session, campaign_id: str, pairs: Set[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+    """(event_id, voter key) pairs that still have votes in the table."""
+    if not pairs:
+        return set()
+    v = _vote_table
+    keys = {key for _, key in pairs}
+    rows = session.connection().execute(
+        select(v.c.event_id, voter_key(v))
+        .where(
+            v.c.campaign_id == campaign_id,
+            v.c.event_id.in_({event_id for event_id, _ in pairs}),
+            or_(*(_voter_clause(key) for key in keys)),
+        )
+        .distinct()
+    )
+    return {(event_id, key) for event_id, key in rows} & pairs
+
+
+def _upsert(session: Session, rows: List[Dict[str, Any]]) -> None:
+    dialect = session.get_bind().dialect.name
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert(_tally_table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_tally_table.c.campaign_id, _tally_table.c.event_id],
+        set_={column: _tally_table.c[column] + stmt.excluded[column] for column in TALLY_COLUMNS},
+    )
+    session.connection().execute(stmt)
+
+
+def apply_vote_replacement(
+    session: Session,
+    campaign_id: str,
+    previous: Iterable[Any],
+    new: Iterable[Vote],
+) -> None:
+    """
+    Apply the tally delta of replacing previous votes with new ones.
+
+    Call after the previous votes were deleted and before the new ones are flushed;
+    previous / new only need event_id, weight, is_super_like, user_id, session_id.
+    Does not commit.
+    """
+    deltas: Dict[str, List[int]] = defaultdict(lambda: [0] * len(TALLY_COLUMNS))
+    voters_before: Set[Tuple[str, str]] = set()
+    voters_after: Set[Tuple[str, str]] = set()
+    for sign, votes, voters in ((-1, previous, voters_before), (1, new, voters_after)):
+        for vote in votes:
+            delta = deltas[vote.event_id]
+            delta[0] += sign * vote.weight
+            delta[1] += sign * max(vote.weight, 0)
+            delta[2] += sign * int(vote.is_super_like)
+            delta[3] += sign
+            key = voter_key_value(vote.user_id, vote.session_id)
+            if key is not None:
+                voters.add((vote.event_id, key))
+
+    touched = voters_before | voters_after
+    remaining = _remaining_voters(session, campaign_id, touched)
+    for pair in touched:
+        had_voter = pair in voters_before or pair in remaining
+        has_voter = pair in voters_after or pair in remaining
+        deltas[pair[0]][4] += int(has_voter) - int(had_voter)
+
+    now = datetime.utcnow()
+    rows = [
+        {"campaign_id": campaign_id, "event_id": event_id, "first_voted_at": now, **dict(zip(TALLY_COLUMNS, delta))}
+        for event_id, delta in deltas.items()
+        if any(delta)
+    ]
+    if not rows:
+        return
+    _upsert(session, rows)
+    # Events nobody votes for anymore leave the tally (and restart first_voted_at)
+    session.connection().execute(
+        delete(_tally_table).where(
+            _tally_table.c.campaign_id == campaign_id,
+            _tally_table.c.event_id.in_([row["event_id"] for row in rows]),
+            _tally_table.c.vote_count <= 0,
+        )
+    )
+
+
+def _computed_tally(campaign_id: Optional[str]) -> Any:
+    v = _vote_table
+    stmt = select(
+        v.c.campaign_id,
+        v.c.event_id,
+        func.sum(v.c.weight).label("weight_sum"),
+        func.sum(case((v.c.weight > 0, v.c.weight), else_=0)).label("positive_weight"),
+        func.sum(case((v.c.is_super_like.is_(True), 1), else_=0)).label("super_like_count"),
+        func.count().label("vote_count"),
+        func.count(func.distinct(voter_key(v))).label("voter_count"),
+        func.min(v.c.created_at).label("first_voted_at"),
+    ).group_by(v.c.campaign_id, v.c.event_id)
+    if campaign_id is not None:
+        stmt = stmt.where(v.c.campaign_id == campaign_id)
+    return stmt
+
+
+def rebuild_tally(session: Session, campaign_id: Optional[str] = None) -> int:
+    """Recompute tally rows from the vote table (all campaigns or one). Does not commit."""
+    conn = session.connection()
+    clear = delete(_tally_table)
+    if campaign_id is not None:
+        clear = clear.where(_tally_table.c.campaign_id == campaign_id)
+    conn.execute(clear)
+    computed = _computed_tally(campaign_id)
+    result = conn.execute(_tally_table.insert().from_select(list(computed.selected_columns.keys()), computed))
+    return result.rowcount
+
+
+def delete_tally(session: Session, campaign_id: str) -> None:
+    session.connection().execute(delete(_tally_table).where(_tally_table.c.campaign_id == campaign_id))
+
+
+def verify_tally(session: Session, campaign_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Differences between maintained and recomputed tally rows; empty if consistent."""
+    conn = session.connection()
+    computed = {(row.campaign_id, row.event_id): row for row in conn.execute(_computed_tally(campaign_id))}
+    stored_stmt = select(_tally_table)
+    if campaign_id is not None:
+        stored_stmt = stored_stmt.where(_tally_table.c.campaign_id == campaign_id)
+    stored = {(row.campaign_id, row.event_id): row for row in conn.execute(stored_stmt)}
+
+    mismatches: List[Dict[str, Any]] = []
+    for key in sorted(computed.keys() | stored.keys()):
+        expected, actual = computed.get(key), stored.get(key)
+        if expected is None and not any(getattr(actual, column) for column in TALLY_COLUMNS):
+            mismatches.append({"campaign_id": key[0], "event_id": key[1], "column": "row", "expected": None, "actual": 0})
+            continue
+        for column in TALLY_COLUMNS:
+            expected_value = getattr(expected, column) if expected is not None else 0
+            actual_value = getattr(actual, column) if actual is not None else 0
+            if expected_value != actual_value:
+                mismatches.append(
+                    {
+                        "campaign_id": key[0],
+                        "event_id": key[1],
+                        "column": column,
+                        "expected": expected_value,
+                        "actual": actual_value,
+                    }
+                )
+    return mismatches
@@ -0,0 +1,154 @@
+"""
+Gemeinsame Hilfen für die Benchmark-Skripte (scripts/bench_*.py).
+
+Jedes Benchmark läuft gegen eine frische temporäre SQLite-DB, damit lokale Daten
+unberührt bleiben. DATABASE_URL wird daher gesetzt, bevor app.* importiert wird.
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_db_path = os.path.join(tempfile.mkdtemp(prefix="eh-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+from sqlmodel import Session, select  # noqa: E402
+
+from app.core.database import engine, init_db  # noqa: E402
+from app.services.budget import rebuild_funding_aggregates  # noqa: E402
+from app.services.participation import rebuild_voter_sketches  # noqa: E402
+from app.services.tally import rebuild_tally  # noqa: E402
+from app.models import (  # noqa: E402
+    Campaign,
+    CampaignEventOption,
+    Department,
+    EventOption,
+    PrivateContribution,
+    StretchGoal,
+    Vote,
+)
+
+
+def setup_db() -> None:
+    init_db()
+
+
+def seed_department(
+    dept_code: str,
+    campaigns: int,
+    events_per_campaign: int = 5,
+    contributions_per_campaign: int = 10,
+    votes_per_campaign: int = 50,
+    seed: int = 42,
+) -> List[str]:
+    """Legt eine Abteilung mit Kampagnen inkl. Events, Stretch Goals, Beiträgen und Votes an."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        event_ids = list(session.exec(select(EventOption.id)).all())
+        if session.get(Department, dept_code) is None:
+            session.add(Department(dept_code=dept_code, name=dept_code))
+        campaign_ids: List[str] = []
+        for i in range(campaigns):
+            campaign = Campaign(
+                name=f"Kampagne {i}",
+                dept_code=dept_code,
+                target_date_range="Q3",
+                total_budget_needed=2000,
+                company_budget_available=800,
+                created_at=now - timedelta(minutes=campaigns - i),
+            )
+            session.add(campaign)
+            session.flush()
+            campaign_ids.append(campaign.id)
+            linked = rng.sample(event_ids, min(events_per_campaign, len(event_ids)))
+            session.add_all(CampaignEventOption(campaign_id=campaign.id, event_option_id=e) for e in linked)
+            session.add_all(
+                StretchGoal(campaign_id=campaign.id, amount_threshold=t, reward_description=f"Ziel {t}")
+                for t in (80, 100, 120)
+            )
+            session.add_all(
+                PrivateContribution(
+                    campaign_id=campaign.id,
+                    user_name=f"User {j}",
+                    amount=rng.choice((10, 20, 50, 120)),
+                    created_at=now - timedelta(minutes=rng.randint(0, 600)),
+                )
+                for j in range(contributions_per_campaign)
+            )
+            session.add_all(
+                Vote(
+                    campaign_id=campaign.id,
+                    event_id=rng.choice(linked),
+                    session_id=f"s{j}",
+                    weight=rng.choice((-1, 1, 1, 2)),
+                    is_super_like=rng.random() < 0.1,
+                    created_at=now - timedelta(minutes=rng.randint(0, 600)),
+                )
+                for j in range(votes_per_campaign)
+            )
+        session.flush()
+        for campaign_id in campaign_ids:
+            rebuild_tally(session, campaign_id)
+            rebuild_funding_aggregates(session, campaign_id)
+        rebuild_voter_sketches(session)
+        session.commit()
+    return campaign_ids
+
+
+def asgi_request(
+    app: Any,
+    method: str,
+    path: str,
+    body: bytes = b"",
+    headers: Optional[Dict[str, str]] = None,
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Minimaler ASGI-Client (ohne httpx), liefert (status, headers, body)."""
+    raw_path, _, query = path.partition("?")
+    request_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    if body:
+        request_headers.append((b"content-length", str(len(body)).encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": raw_path,
+        "raw_path": raw_path.encode(),
+        "query_string": query.encode(),
+        "headers": request_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+        "root_path": "",
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    result: Dict[str, Any] = {"body": b""}
+
+    async def receive() -> Dict[str, Any]:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = {k.decode(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            result["body"] += message.get("body", b"")
+
+    asyncio.run(app(scope, receive, send))
+    return result["status"], result["headers"], result["body"]
+
+
+def timeit(fn: Callable[[], Any], repeat: int = 20) -> float:
+    """Median-Laufzeit in Millisekunden."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
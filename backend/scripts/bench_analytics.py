@@ -0,0 +1,48 @@
+"""
+Benchmark: Team-Analytics einer Kampagne mit 1.000, 10.000 und 50.000 Votes –
+alle Vote-Objekte in Python falten vs. Lesen der campaign_event_tally-Zeilen.
+Nutzung (aus backend-Verzeichnis): python -m scripts.bench_analytics
+"""
+
+import argparse
+
+from scripts import _bench
+
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models import Vote
+from app.services.analytics import aggregate_campaign_votes, build_team_analytics, score_team_analytics
+from app.services.campaigns import get_campaign_event_options
+
+
+def python_path(campaign_id: str):
+    with Session(engine) as session:
+        events = get_campaign_event_options(session, campaign_id)
+        votes = session.exec(select(Vote).where(Vote.campaign_id == campaign_id)).all()
+        return build_team_analytics(events, votes)
+
+
+def tally_path(campaign_id: str):
+    with Session(engine) as session:
+        return score_team_analytics(aggregate_campaign_votes(session, campaign_id))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--votes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    print(f"{'Votes':>7} {'Python ms':>10} {'Tally ms':>9} {'identisch':>10}")
+    for votes in args.votes:
+        (campaign_id,) = _bench.seed_department(f"AN{votes}", 1, events_per_campaign=8, votes_per_campaign=votes)
+        same = python_path(campaign_id) == tally_path(campaign_id)
+        repeat = 5 if votes >= 10000 else 20
+        python_ms = _bench.timeit(lambda: python_path(campaign_id), repeat)
+        tally_ms = _bench.timeit(lambda: tally_path(campaign_id), repeat)
+        print(f"{votes:>7} {python_ms:>10.2f} {tally_ms:>9.2f} {str(same):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: Terminvorschläge (best-dates) für große Teams – Zählmatrix aus
+campaign_availability_tally plus vektorisiertes Ranking vs. Auswerten aller
+Availability-Zeilen pro Anfrage.
+Nutzung (aus backend-Verzeichnis): python -m scripts.bench_best_dates
+"""
+
+import argparse
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from scripts import _bench
+
+import numpy as np
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models import Availability, Campaign
+from app.services.availability import SLOT_BITS, date_candidates, load_slot_counts, rebuild_availability_tally
+
+
+def seed(participants: int, days: int, density: float) -> str:
+    """Eine Kampagne, jede Person mit zufälligen Slots an etwa density * days Tagen."""
+    rng = random.Random(42)
+    start = date(2026, 7, 1)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        campaign = Campaign(
+            name="Großes Team", dept_code="BENCH", target_date_range="Q3", total_budget_needed=2000, company_budget_available=800
+        )
+        session.add(campaign)
+        session.flush()
+        rows = [
+            {
+                "id": f"{p}-{d}",
+                "campaign_id": campaign.id,
+                "session_id": f"s{p}",
+                "date": (start + timedelta(days=d)).isoformat(),
+                "slot_mask": rng.randint(1, 7),
+                "created_at": now,
+            }
+            for p in range(participants)
+            for d in range(days)
+            if rng.random() < density
+        ]
+        session.connection().execute(Availability.__table__.insert(), rows)
+        rebuild_availability_tally(session, campaign.id)
+        session.commit()
+        return campaign.id
+
+
+def row_path(campaign_id: str):
+    """Bisheriger Weg: alle Zeilen laden, pro Person und Tag ODER-verknüpfen, dann zählen."""
+    with Session(engine) as session:
+        rows = session.exec(
+            select(Availability.session_id, Availability.date, Availability.slot_mask).where(
+                Availability.campaign_id == campaign_id
+            )
+        ).all()
+    masks = defaultdict(int)
+    for participant, day, slot_mask in rows:
+        masks[(participant, day)] |= slot_mask
+    counts = defaultdict(int)
+    for (_, day), slot_mask in masks.items():
+        for s, bit in enumerate(SLOT_BITS.values()):
+            if slot_mask & bit:
+                counts[(day, s)] += 1
+    return counts
+
+
+def tally_path(campaign_id: str):
+    with Session(engine) as session:
+        return load_slot_counts(session, campaign_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--participants", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--density", type=float, default=0.5, help="Anteil der Tage mit Angabe pro Person")
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    campaign_id = seed(args.participants, args.days, args.density)
+
+    reference = row_path(campaign_id)
+    slot_counts = tally_path(campaign_id)
+    same = all(
+        reference.get((day, s), 0) == int(slot_counts.counts[s, d])
+        for d, day in enumerate(slot_counts.dates)
+        for s in range(len(SLOT_BITS))
+    ) and len({day for day, _ in reference}) == len(slot_counts.dates)
+
+    row_ms = _bench.timeit(lambda: row_path(campaign_id), 3)
+    tally_ms = _bench.timeit(lambda: tally_path(campaign_id), 10)
+    rank_ms = _bench.timeit(lambda: date_candidates(slot_counts, args.limit), 50)
+    best = date_candidates(slot_counts, args.limit)
+    print(f"{args.participants} Personen x {args.days} Tage, {int(np.sum(slot_counts.available))} Tagesangaben")
+    print(f"  alle Zeilen auswerten:             {row_ms:9.2f} ms")
+    print(f"  Zählmatrix aus Tally (ungecacht):  {tally_ms:9.2f} ms")
+    print(f"  Ranking auf Zählmatrix (gecacht):  {rank_ms:9.2f} ms")
+    print(f"  Zählungen identisch: {same}")
+    print(f"  Vorschlag: {best[0].date} {best[0].slot} ({best[0].attendees} Personen)" if best else "  kein Vorschlag")
+
+
+if __name__ == "__main__":
+    main()
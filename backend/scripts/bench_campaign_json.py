@@ -0,0 +1,64 @@
+"""
+Benchmark: Kampagnenliste einer Abteilung über ORM-Pfad, Core-Read-Model und
+SQLite-JSON-Engine (json_object / json_group_array) für 10, 100 und 1.000 Kampagnen.
+Nutzung (aus backend-Verzeichnis): python -m scripts.bench_campaign_json
+"""
+
+import argparse
+from typing import List
+
+from scripts import _bench
+
+import orjson
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models import Campaign
+from app.schemas.domain import CampaignRead
+from app.services.campaign_json import load_department_campaigns_json
+from app.services.campaign_reads import load_campaign_documents
+from app.services.campaigns import hydrate_campaigns_optimized
+
+_response_adapter = TypeAdapter(List[CampaignRead])
+
+
+def orm_path(dept_code: str) -> bytes:
+    with Session(engine) as session:
+        campaigns = session.exec(select(Campaign).where(Campaign.dept_code == dept_code)).all()
+        hydrated = hydrate_campaigns_optimized(session, campaigns)
+        return orjson.dumps(_response_adapter.dump_python(hydrated, mode="json"))
+
+
+def core_path(dept_code: str) -> bytes:
+    with Session(engine) as session:
+        ids = session.exec(select(Campaign.id).where(Campaign.dept_code == dept_code)).all()
+        return orjson.dumps(load_campaign_documents(session, ids))
+
+
+def sqlite_json_path(dept_code: str) -> bytes:
+    with Session(engine) as session:
+        return load_department_campaigns_json(session, dept_code).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    print(f"{'Kampagnen':>9} {'ORM ms':>9} {'Core ms':>9} {'SQLite-JSON ms':>15} {'identisch':>10}")
+    for size in args.sizes:
+        dept_code = f"BENCH{size}"
+        _bench.seed_department(dept_code, size)
+        reference = orjson.loads(orm_path(dept_code))
+        same = orjson.loads(core_path(dept_code)) == reference == orjson.loads(sqlite_json_path(dept_code))
+        repeat = 5 if size >= 1000 else 20
+        orm_ms = _bench.timeit(lambda: orm_path(dept_code), repeat)
+        core_ms = _bench.timeit(lambda: core_path(dept_code), repeat)
+        json_ms = _bench.timeit(lambda: sqlite_json_path(dept_code), repeat)
+        print(f"{size:>9} {orm_ms:>9.2f} {core_ms:>9.2f} {json_ms:>15.2f} {str(same):>10}")
+
+
+if __name__ == "__main__":
+    main()
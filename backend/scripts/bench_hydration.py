@@ -0,0 +1,90 @@
+"""
+Mikrobenchmark: ORM-Hydration (from_orm + copy + response_model-Validierung) vs.
+schlanker Core-Read-Model-Pfad (app.services.campaign_reads).
+Gemessen werden Zeit und Objekte pro Kampagne sowie der Peak-Speicher.
+Nutzung (aus backend-Verzeichnis): python -m scripts.bench_hydration [--campaigns 200]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, List, Sequence, Tuple
+
+from scripts import _bench
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models import Campaign
+from app.schemas.domain import CampaignRead
+from app.services.campaign_reads import load_campaign_documents
+from app.services.campaigns import hydrate_campaign, hydrate_campaigns_optimized
+
+_response_adapter = TypeAdapter(List[CampaignRead])
+
+
+def orm_detail_path(session: Session, campaign_ids: Sequence[str]) -> Any:
+    # Vorher: get_campaign_detail pro Kampagne, danach response_model-Serialisierung
+    hydrated = [hydrate_campaign(session, session.get(Campaign, cid)) for cid in campaign_ids]
+    return hydrated, _response_adapter.dump_python(hydrated, mode="json")
+
+
+def orm_list_path(session: Session, campaign_ids: Sequence[str]) -> Any:
+    # Vorher: list_campaigns mit hydrate_campaigns_optimized und response_model
+    campaigns = session.exec(select(Campaign).where(Campaign.id.in_(campaign_ids))).all()
+    hydrated = hydrate_campaigns_optimized(session, campaigns)
+    return hydrated, _response_adapter.dump_python(hydrated, mode="json")
+
+
+def lean_path(session: Session, campaign_ids: Sequence[str]) -> Any:
+    return load_campaign_documents(session, campaign_ids)
+
+
+def measure(fn: Callable[[Session, Sequence[str]], Any], campaign_ids: Sequence[str]) -> Tuple[float, int, int]:
+    """Liefert (ms pro Kampagne, gehaltene Objekte pro Kampagne, Peak-KiB)."""
+    timings = []
+    for _ in range(5):
+        with Session(engine) as session:
+            start = time.perf_counter()
+            fn(session, campaign_ids)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    gc.collect()
+    with Session(engine) as session:
+        before = len(gc.get_objects())
+        tracemalloc.start()
+        result = fn(session, campaign_ids)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Ergebnis und Identity Map der Session sind noch referenziert
+        retained = len(gc.get_objects()) - before
+        del result
+
+    n = len(campaign_ids)
+    return timings[len(timings) // 2] * 1000 / n, retained // n, peak // 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--campaigns", type=int, default=200)
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    campaign_ids = _bench.seed_department("BENCH", args.campaigns)
+
+    print(f"{args.campaigns} Kampagnen (je 5 Events, 3 Stretch Goals, 10 Beiträge)")
+    print(f"{'Pfad':<34} {'ms/Kampagne':>12} {'Objekte/Kampagne':>17} {'Peak KiB':>9}")
+    for name, fn in (
+        ("ORM hydrate_campaign (Detail)", orm_detail_path),
+        ("ORM hydrate_campaigns_optimized", orm_list_path),
+        ("Core load_campaign_documents", lean_path),
+    ):
+        ms, objects, peak = measure(fn, campaign_ids)
+        print(f"{name:<34} {ms:>12.3f} {objects:>17} {peak:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: Anteil von JSON-Encoding/-Decoding an der Request-Latenz (stdlib json vs. orjson)
+für list_campaigns und submit_votes.
+Nutzung (aus backend-Verzeichnis): python -m scripts.bench_json [--campaigns 200]
+"""
+
+import argparse
+import json
+from typing import List
+
+from scripts import _bench
+
+import orjson
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.core.limiter import limiter
+from app.main import app
+from app.models import Campaign, EventOption
+from app.schemas.domain import CampaignRead
+from app.services.campaigns import hydrate_campaigns_optimized
+
+
+def _stdlib_dumps(content) -> bytes:
+    # Identical to starlette.responses.JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _report(name: str, latency_ms: float, std_ms: float, fast_ms: float) -> None:
+    before = latency_ms - fast_ms + std_ms
+    print(f"--- {name} ---")
+    print(f"  Latenz vorher (stdlib json, geschätzt): {before:8.2f} ms | JSON-Anteil {std_ms:7.3f} ms ({std_ms / before:6.1%})")
+    print(f"  Latenz nachher (orjson, gemessen):      {latency_ms:8.2f} ms | JSON-Anteil {fast_ms:7.3f} ms ({fast_ms / latency_ms:6.1%})")
+    print(f"  Encode/Decode-Speedup: {std_ms / fast_ms:4.1f}x")
+
+
+def bench_list_campaigns(dept_code: str) -> None:
+    with Session(engine) as session:
+        campaigns = session.exec(select(Campaign).where(Campaign.dept_code == dept_code)).all()
+        hydrated = hydrate_campaigns_optimized(session, campaigns)
+    content = TypeAdapter(List[CampaignRead]).dump_python(hydrated, mode="json")
+
+    std_ms = _bench.timeit(lambda: _stdlib_dumps(content))
+    fast_ms = _bench.timeit(lambda: orjson.dumps(content))
+    latency_ms = _bench.timeit(lambda: _bench.asgi_request(app, "GET", f"/api/campaigns?dept_code={dept_code}"))
+    print(f"list_campaigns: {len(hydrated)} Kampagnen, {len(orjson.dumps(content)) / 1024:.0f} KiB")
+    _report("list_campaigns (Encode)", latency_ms, std_ms, fast_ms)
+
+
+def bench_submit_votes(campaign_id: str) -> None:
+    with Session(engine) as session:
+        event_ids = list(session.exec(select(EventOption.id)).all())
+    payload = [{"event_id": e, "weight": 1, "is_super_like": False} for e in event_ids]
+    body = orjson.dumps(payload)
+
+    std_ms = _bench.timeit(lambda: json.loads(body))
+    fast_ms = _bench.timeit(lambda: orjson.loads(body))
+    latency_ms = _bench.timeit(
+        lambda: _bench.asgi_request(
+            app,
+            "POST",
+            f"/api/campaigns/{campaign_id}/votes?session_id=bench",
+            body=body,
+            headers={"content-type": "application/json"},
+        )
+    )
+    print(f"submit_votes: {len(payload)} Votes, {len(body)} Bytes")
+    _report("submit_votes (Decode)", latency_ms, std_ms, fast_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--campaigns", type=int, default=200)
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    limiter.enabled = False
+    campaign_ids = _bench.seed_department("BENCH", args.campaigns)
+    bench_list_campaigns("BENCH")
+    bench_submit_votes(campaign_ids[0])
+
+
+if __name__ == "__main__":
+    main()
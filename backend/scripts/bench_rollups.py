@@ -0,0 +1,76 @@
+"""
+Benchmark: Abteilungs- und Firmen-Analytics über alle Kampagnen – NumPy-Batch
+(app.services.rollups) vs. build_team_analytics pro Kampagne.
+Nutzung (aus backend-Verzeichnis): python -m scripts.bench_rollups
+"""
+
+import argparse
+from collections import Counter, defaultdict
+
+from scripts import _bench
+
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models import Campaign, Vote
+from app.services.analytics import VoteTotals, build_team_analytics, score_team_analytics, tally_votes
+from app.services.campaigns import get_campaign_event_options
+from app.services.rollups import build_department_analytics
+
+
+def per_campaign_path():
+    """Bisheriger Weg: pro Kampagne Events und Votes laden und build_team_analytics aufrufen."""
+    with Session(engine) as session:
+        results = {}
+        for campaign in session.exec(select(Campaign)).all():
+            events = get_campaign_event_options(session, campaign.id)
+            votes = session.exec(select(Vote).where(Vote.campaign_id == campaign.id)).all()
+            results[campaign.id] = (campaign.dept_code, build_team_analytics(events, votes), tally_votes(events, votes))
+        return results
+
+
+def pooled_reference(per_campaign):
+    """Referenz: Votes aller Kampagnen einer Abteilung zusammengefasst bewerten."""
+    pooled = defaultdict(lambda: VoteTotals(Counter(), 0, 0))
+    for dept_code, _, totals in per_campaign.values():
+        current = pooled[dept_code]
+        pooled[dept_code] = VoteTotals(
+            current.category_scores + totals.category_scores,
+            current.positive_votes + totals.positive_votes,
+            current.outdoor_votes + totals.outdoor_votes,
+        )
+    return {dept_code: score_team_analytics(totals) for dept_code, totals in pooled.items()}
+
+
+def batch_path():
+    with Session(engine) as session:
+        return build_department_analytics(session)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--campaigns", type=int, default=25, help="Kampagnen pro Abteilung")
+    parser.add_argument("--votes", type=int, default=200, help="Votes pro Kampagne")
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    for d in range(args.departments):
+        _bench.seed_department(f"D{d:03}", args.campaigns, events_per_campaign=8, votes_per_campaign=args.votes, seed=d)
+
+    reference = pooled_reference(per_campaign_path())
+    batch = batch_path()
+    same = {k: v.model_dump(exclude={"top_categories", "participation_rate"}) for k, v in reference.items()} == {
+        k: v.model_dump(exclude={"top_categories", "participation_rate"}) for k, v in batch.departments.items()
+    }
+    per_campaign_ms = _bench.timeit(per_campaign_path, 3)
+    batch_ms = _bench.timeit(batch_path, 10)
+    total = args.departments * args.campaigns
+    print(f"{args.departments} Abteilungen, {total} Kampagnen, {total * args.votes} Votes")
+    print(f"  build_team_analytics pro Kampagne: {per_campaign_ms:9.2f} ms")
+    print(f"  NumPy-Batch (alle Abteilungen):   {batch_ms:9.2f} ms")
+    print(f"  Kennzahlen identisch: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Lokaler Stand-in-Cache-Server für CACHE_BACKEND=network.
+Nutzung (aus backend-Verzeichnis): python -m scripts.cache_server [--host 127.0.0.1] [--port 7070]
+"""
+
+import argparse
+
+from app.core.cache import CacheServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event-Horizon Cache-Server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    parser.add_argument("--max-entries", type=int, default=10000)
+    args = parser.parse_args()
+
+    server = CacheServer(args.host, args.port, max_entries=args.max_entries)
+    print(f"Cache-Server lauscht auf {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
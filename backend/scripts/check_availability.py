@@ -0,0 +1,107 @@
+"""
+Konsistenzprüfung: zufällige Verfügbarkeits-Abgaben und -Ersetzungen über POST
+/api/campaigns/{id}/availability, nach jeder Abgabe werden Tally und
+Teilnehmerzahl mit verify_availability_tally gegen die Availability-Tabelle
+geprüft. Danach ersetzen mehrere Threads gleichzeitig die Angaben derselben
+Person (--threads).
+Nutzung (aus backend-Verzeichnis): python -m scripts.check_availability [--rounds 300] [--threads 8]
+"""
+
+import argparse
+import random
+import sys
+import threading
+from typing import Any, Dict, List
+
+from scripts import _bench
+
+import orjson
+from sqlmodel import Session
+
+from app.core.database import engine
+from app.main import app
+from app.services.availability import SLOTS, verify_availability_tally
+
+DATES = [f"2026-07-{day:02d}" for day in range(1, 8)]
+
+
+def random_query(rng: random.Random) -> str:
+    user = f"user_id=u{rng.randint(0, 9)}"
+    session = f"session_id=s{rng.randint(0, 9)}"
+    return rng.choice((user, session, f"{user}&{session}", ""))
+
+
+def random_entries(rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {"date": rng.choice(DATES), "slots": rng.sample(SLOTS, rng.randint(0, len(SLOTS)))}
+        for _ in range(rng.randint(0, 3))
+    ]
+
+
+def submit(campaign_id: str, query: str, entries: List[Dict[str, Any]]) -> int:
+    status, _, body = _bench.asgi_request(
+        app,
+        "POST",
+        f"/api/campaigns/{campaign_id}/availability?{query}",
+        orjson.dumps(entries),
+        {"content-type": "application/json"},
+    )
+    if status != 200:
+        print(f"HTTP {status} {body[:200]!r}")
+    return status
+
+
+def mismatches(campaign_id: str) -> List[Dict[str, Any]]:
+    with Session(engine) as session:
+        return verify_availability_tally(session, campaign_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=8, help="Gleichzeitige Abgaben derselben Person")
+    parser.add_argument("--concurrent-rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    (campaign_id,) = _bench.seed_department("CHK", 1, votes_per_campaign=0, seed=args.seed)
+    rng = random.Random(args.seed)
+
+    failures = 0
+    for i in range(args.rounds):
+        query = random_query(rng)
+        if submit(campaign_id, query, random_entries(rng)) != 200:
+            sys.exit(1)
+        found = mismatches(campaign_id)
+        if found:
+            failures += 1
+            print(f"Runde {i} ({query or 'ohne Kennung'}): {len(found)} Abweichungen, z. B. {found[0]}")
+    print(f"{args.rounds} Abgaben, Runden mit Abweichungen: {failures}")
+
+    concurrent_failures = 0
+    for i in range(args.concurrent_rounds):
+        query = rng.choice(("user_id=u-race", "session_id=s-race"))
+        payloads = [random_entries(rng) for _ in range(args.threads)]
+        barrier = threading.Barrier(args.threads)
+
+        def run(entries: List[Dict[str, Any]]) -> None:
+            barrier.wait()
+            submit(campaign_id, query, entries)
+
+        workers = [threading.Thread(target=run, args=(entries,)) for entries in payloads]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        found = mismatches(campaign_id)
+        if found:
+            concurrent_failures += 1
+            print(f"Parallel-Runde {i} ({query}): {len(found)} Abweichungen, z. B. {found[0]}")
+    print(f"{args.concurrent_rounds} Runden mit {args.threads} parallelen Abgaben, mit Abweichungen: {concurrent_failures}")
+    if failures or concurrent_failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
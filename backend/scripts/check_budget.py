@@ -0,0 +1,132 @@
+"""
+Äquivalenzprüfung für add_contribution: zufällige Beitragsfolgen (Beträge,
+vorbelegte Badges, verschiedene Budgetziele) laufen durch add_contribution und
+durch eine Referenz, die Badges und Stretch Goals nach jedem Beitrag aus allen
+Beiträgen neu berechnet (die Regeln aus app.services.budget, wie vor den
+laufenden Aggregaten). Danach muss rebuild_funding_aggregates die gepflegten
+Aggregate der Kampagne unverändert lassen.
+Nutzung (aus backend-Verzeichnis): python -m scripts.check_budget [--trials 200]
+"""
+
+import argparse
+import random
+import sys
+from typing import List, Optional, Tuple
+
+from scripts import _bench
+
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models import BadgeType, Campaign, Department, PrivateContribution, StretchGoal
+from app.services.budget import WHALE_MINIMUM, add_contribution, rebuild_funding_aggregates
+
+COMPANY_BUDGET = 100
+GOAL_THRESHOLDS = (50, 100, 130)
+
+State = Tuple[List[Tuple[float, Optional[BadgeType]]], List[bool]]
+
+
+class ReferenceCampaign:
+    """Badges und Stretch Goals, nach jedem Beitrag aus allen Beiträgen neu berechnet."""
+
+    def __init__(self, needed: float) -> None:
+        self.needed = needed
+        self.contributions: List[List] = []  # [amount, badge] in Eingangsreihenfolge
+
+    def add(self, amount: float, badge: Optional[BadgeType]) -> State:
+        total_before = COMPANY_BUDGET + sum(c[0] for c in self.contributions)
+        self.contributions.append([amount, badge])
+        total_after = total_before + amount
+        self.contributions[0][1] = BadgeType.early_bird
+        max_amount = max(c[0] for c in self.contributions)
+        for c in self.contributions:
+            if c[1] == BadgeType.whale and c[0] < max_amount:
+                c[1] = None
+            if c[0] == max_amount and c[0] >= WHALE_MINIMUM:
+                c[1] = BadgeType.whale
+        if total_before < self.needed <= total_after:
+            self.contributions[-1][1] = BadgeType.closer
+        percent = total_after / self.needed * 100
+        return [(a, b) for a, b in self.contributions], [percent >= t for t in GOAL_THRESHOLDS]
+
+
+def create_campaign(session: Session, needed: float) -> str:
+    campaign = Campaign(
+        name="Check",
+        dept_code="CHK",
+        target_date_range="Q3",
+        total_budget_needed=needed,
+        company_budget_available=COMPANY_BUDGET,
+    )
+    session.add(campaign)
+    session.flush()
+    session.add_all(
+        StretchGoal(campaign_id=campaign.id, amount_threshold=t, reward_description=f"Ziel {t}") for t in GOAL_THRESHOLDS
+    )
+    session.commit()
+    return campaign.id
+
+
+def stored_state(session: Session, campaign_id: str) -> State:
+    contributions = session.exec(
+        select(PrivateContribution)
+        .where(PrivateContribution.campaign_id == campaign_id)
+        .order_by(PrivateContribution.created_at, PrivateContribution.id)
+    ).all()
+    goals = session.exec(
+        select(StretchGoal).where(StretchGoal.campaign_id == campaign_id).order_by(StretchGoal.amount_threshold)
+    ).all()
+    return [(c.amount, c.badge) for c in contributions], [g.unlocked for g in goals]
+
+
+def aggregates(session: Session, campaign_id: str) -> Tuple:
+    session.expire_all()
+    c = session.get(Campaign, campaign_id)
+    return c.private_total, c.contribution_count, c.max_contribution, c.first_contribution_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trials", type=int, default=200)
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    failures = 0
+    with Session(engine) as session:
+        if session.get(Department, "CHK") is None:
+            session.add(Department(dept_code="CHK", name="CHK"))
+            session.commit()
+        for trial in range(args.trials):
+            rng = random.Random(trial)
+            needed = rng.choice((300, 500, 1000))
+            campaign_id = create_campaign(session, needed)
+            reference = ReferenceCampaign(needed)
+            for step in range(rng.randint(1, 8)):
+                amount = rng.choice((10, 50, 100, 120, 120, 200, 250))
+                badge = rng.choice((None, None, None, BadgeType.whale, BadgeType.early_bird))
+                campaign = session.get(Campaign, campaign_id)
+                add_contribution(
+                    session, campaign, PrivateContribution(campaign_id=campaign_id, user_name="u", amount=amount, badge=badge)
+                )
+                expected, actual = reference.add(amount, badge), stored_state(session, campaign_id)
+                if expected != actual:
+                    failures += 1
+                    print(f"Versuch {trial}, Beitrag {step}: erwartet {expected}, gespeichert {actual}")
+                    break
+
+            maintained = aggregates(session, campaign_id)
+            rebuild_funding_aggregates(session, campaign_id)
+            session.commit()
+            rebuilt = aggregates(session, campaign_id)
+            if maintained != rebuilt:
+                failures += 1
+                print(f"Versuch {trial}: Aggregate {maintained}, neu berechnet {rebuilt}")
+
+    print(f"{args.trials} Versuche, Abweichungen: {failures}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
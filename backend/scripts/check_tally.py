@@ -0,0 +1,128 @@
+"""
+Konsistenzprüfung: zufällige Vote-Abgaben und -Ersetzungen über POST
+/api/campaigns/{id}/votes (registrierte Nutzer, anonyme Sessions, beides, leere
+Listen), nach jeder Abgabe wird die gepflegte campaign_event_tally mit
+verify_tally gegen die Vote-Tabelle geprüft. Danach ersetzen mehrere Threads
+gleichzeitig die Votes derselben Person (--threads); auch dabei darf die Tally
+nicht von der Vote-Tabelle abweichen.
+Nutzung (aus backend-Verzeichnis): python -m scripts.check_tally [--rounds 500] [--seed 1] [--threads 8]
+"""
+
+import argparse
+import random
+import sys
+import threading
+from typing import Any, Dict, List
+
+from scripts import _bench
+
+import orjson
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.core.limiter import limiter
+from app.main import app
+from app.models import CampaignEventOption
+from app.services.tally import verify_tally
+
+
+def random_query(rng: random.Random) -> str:
+    user = f"user_id=u{rng.randint(0, 9)}"
+    session = f"session_id=s{rng.randint(0, 9)}"
+    return rng.choice((user, session, f"{user}&{session}", ""))
+
+
+def submit(campaign_id: str, query: str, votes: List[Dict[str, Any]]) -> int:
+    status, _, body = _bench.asgi_request(
+        app,
+        "POST",
+        f"/api/campaigns/{campaign_id}/votes?{query}",
+        orjson.dumps(votes),
+        {"content-type": "application/json"},
+    )
+    if status != 200:
+        print(f"HTTP {status} {body[:200]!r}")
+    return status
+
+
+def concurrent_rounds(campaign_id: str, events: List[str], rounds: int, threads: int, rng: random.Random) -> int:
+    """Gleichzeitige Ersetzungen durch dieselbe Person; liefert die Zahl der Runden mit Abweichungen."""
+    failures = 0
+    for i in range(rounds):
+        query = rng.choice(("user_id=u-race", "session_id=s-race"))
+        payloads = [
+            [{"event_id": rng.choice(events), "weight": rng.choice((-1, 1, 2))} for _ in range(rng.randint(1, 3))]
+            for _ in range(threads)
+        ]
+        barrier = threading.Barrier(threads)
+
+        def run(votes: List[Dict[str, Any]]) -> None:
+            barrier.wait()
+            submit(campaign_id, query, votes)
+
+        workers = [threading.Thread(target=run, args=(votes,)) for votes in payloads]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        with Session(engine) as session:
+            mismatches = verify_tally(session, campaign_id)
+        if mismatches:
+            failures += 1
+            print(f"Parallel-Runde {i} ({query}): {len(mismatches)} Abweichungen, z. B. {mismatches[0]}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=8, help="Gleichzeitige Abgaben derselben Person")
+    parser.add_argument("--concurrent-rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    _bench.setup_db()
+    limiter.enabled = False
+    campaign_ids = _bench.seed_department("CHK", 2, events_per_campaign=4, votes_per_campaign=20, seed=args.seed)
+    with Session(engine) as session:
+        linked = {
+            campaign_id: list(
+                session.exec(
+                    select(CampaignEventOption.event_option_id).where(CampaignEventOption.campaign_id == campaign_id)
+                ).all()
+            )
+            for campaign_id in campaign_ids
+        }
+
+    rng = random.Random(args.seed)
+    failures = 0
+    for i in range(args.rounds):
+        campaign_id = rng.choice(campaign_ids)
+        votes = [
+            {
+                "event_id": rng.choice(linked[campaign_id]),
+                "weight": rng.choice((-1, 1, 1, 2)),
+                "is_super_like": rng.random() < 0.2,
+            }
+            for _ in range(rng.randint(0, 3))
+        ]
+        query = random_query(rng)
+        if submit(campaign_id, query, votes) != 200:
+            sys.exit(1)
+        with Session(engine) as session:
+            mismatches = verify_tally(session, campaign_id)
+        if mismatches:
+            failures += 1
+            print(f"Runde {i} ({query or 'ohne Kennung'}): {len(mismatches)} Abweichungen, z. B. {mismatches[0]}")
+
+    print(f"{args.rounds} Abgaben, Runden mit Abweichungen: {failures}")
+
+    campaign_id = campaign_ids[0]
+    concurrent_failures = concurrent_rounds(campaign_id, linked[campaign_id], args.concurrent_rounds, args.threads, rng)
+    print(f"{args.concurrent_rounds} Runden mit {args.threads} parallelen Abgaben, mit Abweichungen: {concurrent_failures}")
+    if failures or concurrent_failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
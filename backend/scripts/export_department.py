@@ -0,0 +1,82 @@
+"""
+Streamt alle Kampagnen, Votes, Verfügbarkeiten und Beiträge einer Abteilung als
+NDJSON (für HR-Reporting), optional gzip-komprimiert. Speicherbedarf konstant.
+Nach jeder Seite steht eine checkpoint-Zeile mit Cursor; mit --cursor wird ein
+abgebrochener Export dort fortgesetzt. Eine NDJSON-Datei wird dafür hinter der
+checkpoint-Zeile dieses Cursors abgeschnitten und weitergeschrieben. Ein
+abgebrochenes gzip-Member lässt sich nicht fortsetzen: mit --gzip geht der Rest
+in eine neue Datei.
+Nutzung (aus backend-Verzeichnis):
+    python -m scripts.export_department IT -o it.ndjson.gz --gzip
+    python -m scripts.export_department IT -o it.ndjson --cursor <cursor>
+    python -m scripts.export_department IT -o it-2.ndjson.gz --gzip --cursor <cursor>
+"""
+
+import argparse
+import os
+import sys
+from typing import Optional
+
+import orjson
+
+from app.services.export import EXPORT_PAGE_SIZE, buffered, gzip_stream, iter_department_export, validate_export_cursor
+
+
+def checkpoint_end(path: str, cursor: str) -> Optional[int]:
+    """Byte-Offset hinter der checkpoint-Zeile mit diesem Cursor (None, falls nicht vorhanden)."""
+    offset, end = 0, None
+    with open(path, "rb") as f:
+        for line in f:
+            offset += len(line)
+            if not line.endswith(b"\n") or b'"checkpoint"' not in line:
+                continue
+            record = orjson.loads(line)
+            if record.get("type") == "checkpoint" and record.get("cursor") == cursor:
+                end = offset
+    return end
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dept_code")
+    parser.add_argument("-o", "--output", help="Zieldatei (Standard: stdout)")
+    parser.add_argument("--cursor", help="Cursor der letzten checkpoint-Zeile")
+    parser.add_argument("--gzip", action="store_true", help="gzip-komprimiert schreiben")
+    parser.add_argument("--page-size", type=int, default=EXPORT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    try:
+        validate_export_cursor(args.cursor)
+    except ValueError:
+        parser.error("Ungültiger Cursor")
+
+    chunks = buffered(iter_department_export(args.dept_code.strip().upper(), args.cursor, args.page_size))
+    if args.gzip:
+        chunks = gzip_stream(chunks)
+
+    # Fortsetzen: NDJSON hinter dem letzten vollständigen checkpoint abschneiden und
+    # weiterschreiben, gzip immer in eine neue Datei (kein Anhängen an ein kaputtes Member)
+    mode = "wb"
+    if args.cursor and args.output and os.path.exists(args.output):
+        if args.gzip:
+            parser.error("Mit --gzip und --cursor in eine neue Datei schreiben")
+        end = checkpoint_end(args.output, args.cursor)
+        if end is None:
+            parser.error("checkpoint-Zeile mit diesem Cursor nicht in der Zieldatei gefunden")
+        with open(args.output, "r+b") as f:
+            f.truncate(end)
+        mode = "ab"
+    out = open(args.output, mode) if args.output else sys.stdout.buffer
+    try:
+        written = 0
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+    print(f"{written} Bytes geschrieben", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Prüft die Vote-Tally-Tabelle (campaign_event_tally) gegen die Vote-Tabelle und
+baut sie bei Bedarf neu auf.
+Nutzung (aus backend-Verzeichnis):
+    python -m scripts.rebuild_tally               # nur prüfen
+    python -m scripts.rebuild_tally --rebuild     # prüfen und neu aufbauen
+    python -m scripts.rebuild_tally --campaign <id> --rebuild
+"""
+
+import argparse
+import sys
+
+from app.core.database import init_db, session_scope
+from app.services.tally import rebuild_tally, verify_tally
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--campaign", help="Nur diese Kampagne")
+    parser.add_argument("--rebuild", action="store_true", help="Tally aus den Votes neu berechnen")
+    args = parser.parse_args()
+
+    init_db()
+    with session_scope() as session:
+        mismatches = verify_tally(session, args.campaign)
+        for m in mismatches[:50]:
+            print(f"  {m['campaign_id']} / {m['event_id']}: {m['column']} erwartet {m['expected']}, gespeichert {m['actual']}")
+        if len(mismatches) > 50:
+            print(f"  ... {len(mismatches) - 50} weitere")
+        print(f"Abweichungen: {len(mismatches)}")
+
+        if args.rebuild:
+            rows = rebuild_tally(session, args.campaign)
+            print(f"Neu aufgebaut: {rows} Zeilen")
+        elif mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()